@@ -0,0 +1,45 @@
+"""
+Admin API endpoints
+
+Every endpoint requires the X-Admin-Token header to match settings.admin_token.
+With no token configured the admin API answers 404.
+"""
+import secrets
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+
+from app.config import settings
+from app.schemas import SlowQuery
+from app.slow_queries import slow_query_log
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/slow-queries", response_model=List[SlowQuery])
+async def list_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    route: Optional[str] = Query(None, description="Only statements issued by this route template")
+):
+    """
+    Statements slower than the configured threshold, newest first,
+    with their EXPLAIN (ANALYZE, BUFFERS) plans
+    """
+    entries = slow_query_log.entries()
+    if route:
+        entries = [entry for entry in entries if entry["route"] == route]
+    return entries[:limit]
+
+
+@router.delete("/slow-queries", status_code=204)
+async def clear_slow_queries():
+    """Empty the slow query log"""
+    slow_query_log.clear()
+    return Response(status_code=204)
@@ -1,23 +1,143 @@
 """
 Land data API endpoints
 """
-import json
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-
-from app.database import get_db
-from app.models import Land
+import orjson
+from itertools import chain
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import JSON, Float, Integer, Text, any_, bindparam, cast, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from geoalchemy2 import Geography
+
+from app.api.search import SEARCH_COLUMNS
+from app.cache import get_dataset_version, tile_cache
+from app.config import settings
+from app.database import get_async_db
+from app.formats import (
+    FORMAT_MEDIA_TYPES,
+    GEOMETRY_COLUMN,
+    arrow_stream,
+    fetch_flatgeobuf,
+    require_format_support
+)
+from app.models import Land, LandCluster
+from app.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_conditions,
+    keyset_order
+)
 from app.schemas import (
+    LandBatchRequest,
+    LandBatchResponse,
     LandResponse,
     LandDetailResponse,
+    NearbyLandResponse,
     GeoJSONFeatureCollection,
     GeoJSONFeature
 )
 
 router = APIRouter()
 
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+# Parcels are clipped and quantized to the tile grid by PostGIS; the && filter
+# on the 4326 envelope keeps the lookup on the GiST index.
+TILE_SQL = text("""
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom
+    ),
+    mvtgeom AS (
+        SELECT
+            ST_AsMVTGeom(
+                ST_Transform(l.geometry, 3857), bounds.geom, :extent, :buffer, true
+            ) AS geom,
+            l.id,
+            l.city,
+            l.district,
+            l.section_name,
+            l.parcel_no,
+            l.area::float8 AS area,
+            l.announced_value,
+            l.announced_land_price,
+            l.owner_name
+        FROM lands l, bounds
+        WHERE l.geometry && ST_Transform(bounds.geom, 4326)
+    )
+    SELECT ST_AsMVT(mvtgeom, 'lands', :extent, 'geom') FROM mvtgeom
+""")
+
+# (max zoom, simplified geometry column, GeoJSON decimal digits); deeper zooms
+# use the full geometry. Rows not yet simplified fall back to the full geometry.
+GEOMETRY_LEVELS = [
+    (12, Land.geometry_low, 5),
+    (14, Land.geometry_medium, 6),
+]
+FULL_GEOMETRY_PRECISION = 7
+
+# Attributes available to POST /batch: the LandResponse fields
+BATCH_COLUMNS = {column.name: column for column in SEARCH_COLUMNS}
+BATCH_FIELDS = list(BATCH_COLUMNS)
+
+# Columns behind the LandResponse fields, for endpoints returning row mappings
+LAND_RESPONSE_COLUMNS = [getattr(Land, name) for name in LandResponse.model_fields]
+
+# KNN candidates fetched per requested neighbour before re-ranking by
+# geodesic distance (index order is planar, in degrees)
+NEAREST_CANDIDATE_FACTOR = 4
+
+# bbox feature properties for the binary formats (same as the GeoJSON ones)
+BBOX_PROPERTIES = [
+    Land.id,
+    Land.city,
+    Land.district,
+    Land.section_name,
+    Land.parcel_no,
+    cast(func.nullif(Land.area, 0), Float).label('area'),
+    Land.announced_value,
+    Land.announced_land_price,
+    Land.owner_name,
+]
+
+
+def _stream_feature_collection(features: List[str], chunk_size: int = 500):
+    """
+    Splice pre-serialized GeoJSON features into a FeatureCollection
+
+    Yields the document in chunks of chunk_size features so nothing is
+    parsed or re-encoded in Python.
+    """
+    yield b'{"type":"FeatureCollection","features":['
+
+    for start in range(0, len(features), chunk_size):
+        chunk = ",".join(features[start:start + chunk_size])
+        yield (chunk if start == 0 else "," + chunk).encode()
+
+    yield b']}'
+
+
+def _geometry_for_zoom(zoom: Optional[int]):
+    """(geometry expression, GeoJSON precision) for a map zoom level"""
+    if zoom is None:
+        return Land.geometry, None
+
+    for max_zoom, column, precision in GEOMETRY_LEVELS:
+        if zoom <= max_zoom:
+            return func.coalesce(column, Land.geometry), precision
+
+    return Land.geometry, FULL_GEOMETRY_PRECISION
+
+
+def _geojson_for_zoom(zoom: Optional[int]):
+    """Build the ST_AsGeoJSON expression matching a map zoom level"""
+    geometry, precision = _geometry_for_zoom(zoom)
+    if precision is None:
+        return func.ST_AsGeoJSON(geometry)
+    return func.ST_AsGeoJSON(geometry, precision)
+
 
 @router.get("/bbox", response_model=GeoJSONFeatureCollection)
 async def get_lands_by_bbox(
@@ -26,57 +146,117 @@ async def get_lands_by_bbox(
     max_lng: float = Query(..., description="Maximum longitude"),
     max_lat: float = Query(..., description="Maximum latitude"),
     limit: int = Query(default=100, ge=1, le=3000, description="Maximum number of results"),
-    db: Session = Depends(get_db)
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom level (selects geometry simplification)"),
+    format: Literal["geojson", "fgb", "arrow"] = Query("geojson", description="Output format"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get lands within a bounding box (for map viewport)
 
     This endpoint is optimized for map rendering - returns GeoJSON format
-    with spatial indexing for fast queries.
+    with spatial indexing for fast queries. Features are serialized by
+    PostgreSQL and streamed as-is. When `zoom` is given, geometries
+    come from the precomputed simplification level for that zoom and
+    coordinates are rounded to a matching precision.
+
+    `format=fgb` returns the same features as FlatGeobuf and `format=arrow`
+    as an Arrow IPC stream with WKB geometry (geoarrow.wkb).
     """
+    require_format_support(format)
+
     # Create bounding box envelope
     bbox_wkt = f"POLYGON(({min_lng} {min_lat}, {max_lng} {min_lat}, {max_lng} {max_lat}, {min_lng} {max_lat}, {min_lng} {min_lat}))"
+    in_bbox = func.ST_Intersects(
+        Land.geometry,
+        func.ST_GeomFromText(bbox_wkt, 4326)
+    )
 
-    # Query lands that intersect with bounding box
-    lands = db.query(
-        Land.id,
-        Land.city,
-        Land.district,
-        Land.section_name,
-        Land.parcel_no,
-        Land.area,
-        Land.announced_value,
-        Land.announced_land_price,
-        Land.owner_name,
-        func.ST_AsGeoJSON(Land.geometry).label('geometry_json')
-    ).filter(
-        func.ST_Intersects(
-            Land.geometry,
-            func.ST_GeomFromText(bbox_wkt, 4326)
-        )
-    ).limit(limit).all()
+    if format != "geojson":
+        geometry, _ = _geometry_for_zoom(zoom)
+        columns = [*BBOX_PROPERTIES, geometry.label(GEOMETRY_COLUMN)]
+
+        if format == "fgb":
+            page = select(*columns).where(in_bbox).limit(limit).subquery("page")
+            (document,) = await fetch_flatgeobuf(db, page)
+            return Response(content=document, media_type=FORMAT_MEDIA_TYPES["fgb"])
+
+        columns[-1] = func.ST_AsBinary(geometry).label(GEOMETRY_COLUMN)
+        query = select(*columns).where(in_bbox).limit(limit)
+        rows = (await db.execute(query)).all()
+        return Response(content=arrow_stream(query, rows), media_type=FORMAT_MEDIA_TYPES["arrow"])
 
-    # Convert to GeoJSON FeatureCollection
-    features = []
-    for land in lands:
-        geometry = json.loads(land.geometry_json) if land.geometry_json else None
+    # Each row is one complete Feature serialized by PostgreSQL
+    features = (await db.execute(
+        select(
+            cast(
+                func.json_build_object(
+                    'type', 'Feature',
+                    'geometry', cast(_geojson_for_zoom(zoom), JSON),
+                    'properties', func.json_build_object(
+                        'id', Land.id,
+                        'city', Land.city,
+                        'district', Land.district,
+                        'section_name', Land.section_name,
+                        'parcel_no', Land.parcel_no,
+                        'area', cast(func.nullif(Land.area, 0), Float),
+                        'announced_value', Land.announced_value,
+                        'announced_land_price', Land.announced_land_price,
+                        'owner_name', Land.owner_name
+                    )
+                ),
+                Text
+            )
+        ).where(in_bbox).limit(limit)
+    )).scalars().all()
 
-        feature = GeoJSONFeature(
+    return StreamingResponse(
+        _stream_feature_collection(features),
+        media_type="application/json"
+    )
+
+
+@router.get("/clusters", response_model=GeoJSONFeatureCollection)
+async def get_land_clusters(
+    min_lng: float = Query(..., description="Minimum longitude"),
+    min_lat: float = Query(..., description="Minimum latitude"),
+    max_lng: float = Query(..., description="Maximum longitude"),
+    max_lat: float = Query(..., description="Maximum latitude"),
+    zoom: int = Query(..., ge=0, le=22, description="Map zoom level"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get aggregated land clusters within a bounding box (for low zoom levels)
+
+    Returns one Point feature per grid cell with the parcel count, total area
+    and the mean position of the parcels in it. Cells come from the grid the
+    importer precomputes; zoom is clamped to the available levels.
+    """
+    zoom = min(max(zoom, settings.cluster_min_zoom), settings.cluster_max_zoom)
+    envelope = func.ST_MakeEnvelope(min_lng, min_lat, max_lng, max_lat, 4326)
+
+    cells = (await db.execute(
+        select(
+            LandCluster.parcel_count,
+            LandCluster.total_area,
+            func.ST_X(LandCluster.centroid).label('lng'),
+            func.ST_Y(LandCluster.centroid).label('lat')
+        ).where(
+            LandCluster.zoom == zoom,
+            LandCluster.centroid.op('&&')(envelope)
+        )
+    )).all()
+
+    features = [
+        GeoJSONFeature(
             type="Feature",
-            geometry=geometry,
+            geometry={"type": "Point", "coordinates": [cell.lng, cell.lat]},
             properties={
-                "id": land.id,
-                "city": land.city,
-                "district": land.district,
-                "section_name": land.section_name,
-                "parcel_no": land.parcel_no,
-                "area": float(land.area) if land.area else None,
-                "announced_value": land.announced_value,
-                "announced_land_price": land.announced_land_price,
-                "owner_name": land.owner_name,
+                "parcel_count": cell.parcel_count,
+                "total_area": float(cell.total_area) if cell.total_area else 0.0,
             }
         )
-        features.append(feature)
+        for cell in cells
+    ]
 
     return GeoJSONFeatureCollection(
         type="FeatureCollection",
@@ -84,18 +264,187 @@ async def get_lands_by_bbox(
     )
 
 
+@router.get(
+    "/tiles/{z}/{x}/{y}.mvt",
+    response_class=Response,
+    responses={200: {"content": {MVT_MEDIA_TYPE: {}}}, 204: {"description": "Empty tile"}}
+)
+async def get_land_tile(
+    z: int,
+    x: int,
+    y: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get land parcels as a Mapbox Vector Tile (layer name: `lands`)
+
+    Encoded tiles are cached in memory per dataset version, so repeated pans
+    over the same area never reach the database. Tiles below
+    `tile_min_zoom` are returned empty.
+    """
+    if not 0 <= z <= 22 or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+        raise HTTPException(status_code=400, detail="Invalid tile coordinates")
+
+    headers = {"Cache-Control": "public, max-age=300"}
+
+    if z < settings.tile_min_zoom:
+        return Response(status_code=204, headers=headers)
+
+    cache_key = (await get_dataset_version(db), z, x, y)
+    tile = tile_cache.get(cache_key)
+
+    if tile is None:
+        tile = (await db.execute(TILE_SQL, {
+            "z": z,
+            "x": x,
+            "y": y,
+            "extent": settings.tile_extent,
+            "buffer": settings.tile_buffer,
+        })).scalar()
+        tile = bytes(tile) if tile else b""
+        tile_cache.set(cache_key, tile)
+        headers["X-Cache"] = "MISS"
+    else:
+        headers["X-Cache"] = "HIT"
+
+    if not tile:
+        return Response(status_code=204, headers=headers)
+
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE, headers=headers)
+
+
+@router.post("/batch", response_model=LandBatchResponse)
+async def get_lands_batch(
+    request: LandBatchRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get several land parcels in one query
+
+    Lands are returned in request order (duplicate ids once); ids that do
+    not exist are listed in `missing`. `fields` limits the attributes
+    returned and `include_geometry` adds the GeoJSON geometry, so list views
+    only pay for what they show. Each object is serialized by PostgreSQL.
+    """
+    fields = BATCH_FIELDS if request.fields is None else ["id", *dict.fromkeys(request.fields)]
+    unknown = [field for field in fields if field not in BATCH_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    ids = list(dict.fromkeys(request.ids))
+    pairs = [(field, BATCH_COLUMNS[field]) for field in dict.fromkeys(fields)]
+    if request.include_geometry:
+        pairs.append(("geometry", cast(func.ST_AsGeoJSON(Land.geometry), JSON)))
+
+    ids_param = bindparam("ids", ids, type_=ARRAY(Integer))
+    rows = (await db.execute(
+        select(
+            Land.id,
+            cast(func.json_build_object(*chain.from_iterable(pairs)), Text)
+        ).where(
+            Land.id == any_(ids_param)
+        ).order_by(func.array_position(ids_param, Land.id))
+    )).all()
+
+    found = {row[0] for row in rows}
+    missing = [land_id for land_id in ids if land_id not in found]
+
+    content = b"".join([
+        b'{"lands":[',
+        ",".join(row[1] for row in rows).encode(),
+        b'],"missing":',
+        orjson.dumps(missing),
+        b"}",
+    ])
+    return Response(content=content, media_type="application/json")
+
+
+def _point(lng: float, lat: float):
+    return func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326)
+
+
+@router.get("/at", response_model=List[LandDetailResponse])
+async def get_lands_at(
+    lng: float = Query(..., ge=-180, le=180, description="Longitude"),
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    limit: int = Query(default=10, ge=1, le=50, description="Maximum number of results"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the land parcels containing a point (e.g. a map click)
+
+    The `&&` bounding-box test is answered by the spatial index and only
+    its candidates get the exact `ST_Contains` check. Overlapping parcels
+    are returned smallest first; no parcel gives an empty list.
+    """
+    point = _point(lng, lat)
+    rows = (await db.execute(
+        select(
+            *LAND_RESPONSE_COLUMNS,
+            func.ST_AsGeoJSON(Land.geometry).label('geometry_json')
+        ).where(
+            Land.geometry.op('&&')(point),
+            func.ST_Contains(Land.geometry, point)
+        ).order_by(Land.area.asc().nulls_last(), Land.id).limit(limit)
+    )).all()
+
+    lands = []
+    for row in rows:
+        land = dict(row._mapping)
+        geometry_json = land.pop('geometry_json')
+        land['geometry'] = orjson.loads(geometry_json) if geometry_json else None
+        lands.append(land)
+    return lands
+
+
+@router.get("/nearest", response_model=List[NearbyLandResponse])
+async def get_nearest_lands(
+    lng: float = Query(..., ge=-180, le=180, description="Longitude"),
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    k: int = Query(default=5, ge=1, le=100, description="Number of parcels"),
+    max_distance: Optional[float] = Query(None, gt=0, description="Maximum distance (meters)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the k land parcels nearest to a point, with distances in meters
+
+    Candidates come from a KNN (`<->`) index scan; they are re-ranked by
+    geodesic distance to the parcel boundary (0 inside the parcel).
+    """
+    point = _point(lng, lat)
+    candidates = select(Land.id).order_by(
+        Land.geometry.op('<->')(point)
+    ).limit(k * NEAREST_CANDIDATE_FACTOR).subquery("candidates")
+
+    distance = func.ST_Distance(
+        cast(Land.geometry, Geography(srid=4326)),
+        cast(point, Geography(srid=4326)),
+        type_=Float
+    )
+    query = select(*LAND_RESPONSE_COLUMNS, distance.label("distance")).join(
+        candidates, candidates.c.id == Land.id
+    )
+    if max_distance is not None:
+        query = query.where(distance <= max_distance)
+
+    rows = (await db.execute(query.order_by("distance", Land.id).limit(k))).all()
+    return [row._mapping for row in rows]
+
+
 @router.get("/{land_id}", response_model=LandDetailResponse)
 async def get_land_by_id(
     land_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed information for a specific land parcel
     """
-    land = db.query(
-        Land,
-        func.ST_AsGeoJSON(Land.geometry).label('geometry_json')
-    ).filter(Land.id == land_id).first()
+    land = (await db.execute(
+        select(
+            Land,
+            func.ST_AsGeoJSON(Land.geometry).label('geometry_json')
+        ).where(Land.id == land_id)
+    )).first()
 
     if not land:
         raise HTTPException(status_code=404, detail="Land not found")
@@ -103,7 +452,7 @@ async def get_land_by_id(
     land_obj, geometry_json = land
 
     # Convert geometry to GeoJSON dict
-    geometry = json.loads(geometry_json) if geometry_json else None
+    geometry = orjson.loads(geometry_json) if geometry_json else None
 
     # Create response
     response_dict = {
@@ -135,12 +484,30 @@ async def get_land_by_id(
 
 @router.get("/", response_model=List[LandResponse])
 async def list_lands(
+    response: Response,
     limit: int = Query(default=20, ge=1, le=100, description="Number of results"),
-    offset: int = Query(default=0, ge=0, description="Offset for pagination"),
-    db: Session = Depends(get_db)
+    offset: int = Query(default=0, ge=0, description="Offset for pagination (legacy)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List lands with pagination
+
+    Lands are ordered by id. Full pages carry an `X-Next-Cursor` header to
+    pass back as `cursor` for the next page.
     """
-    lands = db.query(Land).offset(offset).limit(limit).all()
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+
+    query = select(Land).order_by(*keyset_order(None, Land.id, False))
+
+    if cursor:
+        _, last_id, _ = decode_cursor(cursor, "id", False)
+        query = query.where(*keyset_conditions(None, Land.id, None, last_id, False))
+
+    lands = (await db.execute(query.offset(offset).limit(limit))).scalars().all()
+
+    if len(lands) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor("id", False, None, lands[-1].id)
+
     return lands
@@ -1,124 +1,440 @@
 """
 Search API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from decimal import Decimal
+from itertools import chain
+from typing import List, Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import JSON, Float, Text, cast, func, select, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 
-from app.database import get_db
+from app.database import get_async_db
+from app.export import csv_stream, geojsonseq_stream, parquet_stream
+from app.formats import (
+    FORMAT_MEDIA_TYPES,
+    GEOMETRY_COLUMN,
+    arrow_stream,
+    fetch_flatgeobuf,
+    require_format_support
+)
 from app.models import Land
-from app.schemas import LandResponse
+from app.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_conditions,
+    keyset_order
+)
+from app.cache import get_dataset_version
+from app.gazetteer import gazetteer
+from app.schemas import GazetteerCity, LandResponse, Suggestion
+from app.typeahead import typeahead_index
 
 router = APIRouter()
 
+# Columns of the binary formats and exports: the LandResponse fields
+SEARCH_COLUMNS = [
+    Land.id,
+    Land.section_code,
+    Land.section_name,
+    Land.parcel_no,
+    Land.city,
+    Land.district,
+    cast(Land.area, Float).label("area"),
+    Land.land_use_zone,
+    Land.land_use_type,
+    Land.announced_value,
+    Land.announced_land_price,
+    Land.owner_name,
+    Land.owner_id,
+    Land.owner_type,
+    Land.right_range_type,
+    Land.right_denominator,
+    Land.right_numerator,
+    Land.declared_land_price,
+    Land.manager_name,
+    Land.created_at,
+]
+
+# Export formats: file extension and media type
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv; charset=utf-8"),
+    "geojsonseq": ("geojsons", "application/geo+json-seq"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+# Sortable keys: column (None means id only) and cursor value converter
+SORT_KEYS = {
+    "id": (None, None),
+    "area": (Land.area, Decimal),
+    "announced_value": (Land.announced_value, int),
+}
+
+
+class SearchFilters:
+    """
+    Search criteria shared by /api/search/ and /api/search/export
+
+    Declared as a dependency so both endpoints take the same query
+    parameters and build the same WHERE clauses.
+    """
+
+    def __init__(
+        self,
+        city: str = Query(None, description="City name (exact match)"),
+        district: str = Query(None, description="District name (exact match)"),
+        section_code: str = Query(None, description="Section code (exact match)"),
+        section_name: str = Query(None, description="Section name (partial match)"),
+        parcel_no: str = Query(None, description="Parcel number (partial match)"),
+        owner_name: str = Query(None, description="Owner name (partial match)"),
+        min_area: float = Query(None, description="Minimum area (square meters)"),
+        max_area: float = Query(None, description="Maximum area (square meters)"),
+        match_mode: Literal["contains", "similarity"] = Query("contains", description="How section_name, parcel_no and owner_name are matched"),
+        min_similarity: float = Query(default=0.3, ge=0, le=1, description="Minimum trigram similarity (similarity mode)")
+    ):
+        self.match_mode = match_mode
+        self.min_similarity = min_similarity
+        self.conditions = []
+        # Mean trigram similarity of the text fields (similarity mode only)
+        self.similarity = None
+
+        if city:
+            self.conditions.append(Land.city == city)
+
+        if district:
+            self.conditions.append(Land.district == district)
+
+        if section_code:
+            self.conditions.append(Land.section_code == section_code)
+
+        # Partial-match fields, served by the trigram GIN indexes in both modes
+        text_filters = [
+            (column, value)
+            for column, value in (
+                (Land.section_name, section_name),
+                (Land.parcel_no, parcel_no),
+                (Land.owner_name, owner_name),
+            )
+            if value
+        ]
+
+        if match_mode == "similarity":
+            if not text_filters:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Similarity mode needs section_name, parcel_no or owner_name"
+                )
+
+            self.conditions.extend(column.op('%')(value) for column, value in text_filters)
+
+            scores = [func.similarity(column, value, type_=Float) for column, value in text_filters]
+            self.similarity = sum(scores[1:], scores[0]) / float(len(scores))
+        else:
+            self.conditions.extend(column.ilike(f"%{value}%") for column, value in text_filters)
+
+        if min_area is not None:
+            self.conditions.append(Land.area >= min_area)
+
+        if max_area is not None:
+            self.conditions.append(Land.area <= max_area)
+
+    async def prepare(self, db: AsyncSession):
+        """Apply the session settings the conditions depend on (once per transaction)"""
+        if self.match_mode == "similarity":
+            # The indexable % operator compares against this transaction-local threshold
+            await db.execute(
+                select(func.set_config('pg_trgm.similarity_threshold', str(self.min_similarity), True))
+            )
+
 
 @router.get("/", response_model=List[LandResponse])
 async def search_lands(
-    city: str = Query(None, description="City name (exact match)"),
-    district: str = Query(None, description="District name (exact match)"),
-    section_code: str = Query(None, description="Section code (exact match)"),
-    section_name: str = Query(None, description="Section name (partial match)"),
-    parcel_no: str = Query(None, description="Parcel number (partial match)"),
-    owner_name: str = Query(None, description="Owner name (partial match)"),
-    min_area: float = Query(None, description="Minimum area (square meters)"),
-    max_area: float = Query(None, description="Maximum area (square meters)"),
+    response: Response,
+    criteria: SearchFilters = Depends(),
     limit: int = Query(default=100, ge=1, le=10000, description="Maximum number of results"),
-    offset: int = Query(default=0, ge=0, description="Result offset for pagination"),
-    db: Session = Depends(get_db)
+    offset: int = Query(default=0, ge=0, description="Result offset for pagination (legacy)"),
+    sort_by: Literal["id", "area", "announced_value"] = Query("id", description="Sort key"),
+    descending: bool = Query(False, description="Sort in descending order"),
+    cursor: str = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    format: Literal["json", "fgb", "arrow"] = Query("json", description="Output format"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Search lands by various criteria
 
     All criteria are combined with AND logic.
     Partial matches are supported for section_name, parcel_no, and owner_name.
-    """
-    query = db.query(Land)
+    With `match_mode=similarity` those fields are fuzzy-matched instead:
+    rows must reach `min_similarity` on every given field and are ranked by
+    mean trigram similarity (`sort_by` is ignored).
 
-    # Build filters
-    filters = []
+    Pages are returned in `sort_by` order. When a page is full, the
+    `X-Next-Cursor` response header holds a cursor for the next one; pass it
+    back as `cursor` to continue without the cost of a deep `offset`.
 
-    if city:
-        filters.append(Land.city == city)
+    `format=fgb` (FlatGeobuf) and `format=arrow` (Arrow IPC stream, WKB
+    geometry) return the same page with each parcel's geometry.
+    """
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
 
-    if district:
-        filters.append(Land.district == district)
+    require_format_support(format)
 
-    if section_code:
-        filters.append(Land.section_code == section_code)
+    sort_column, convert = SORT_KEYS[sort_by]
 
-    if section_name:
-        filters.append(Land.section_name.ilike(f"%{section_name}%"))
+    await criteria.prepare(db)
+    filters = list(criteria.conditions)
 
-    if parcel_no:
-        filters.append(Land.parcel_no.ilike(f"%{parcel_no}%"))
+    if criteria.similarity is not None:
+        sort_by, descending = "similarity", True
+        sort_column, convert = criteria.similarity, float
 
-    if owner_name:
-        filters.append(Land.owner_name.ilike(f"%{owner_name}%"))
+    # Continue after the last row of the previous page: one condition per
+    # block of rows (non-NULL / NULL sort keys) still ahead
+    phases = [[]]
+    if cursor:
+        last_value, last_id, null_tail = decode_cursor(cursor, sort_by, descending)
+        if last_value is not None and convert is not None:
+            last_value = convert(last_value)
+        phases = [
+            [condition] for condition in
+            keyset_conditions(sort_column, Land.id, last_value, last_id, descending, null_tail)
+        ]
 
-    if min_area is not None:
-        filters.append(Land.area >= min_area)
+    order = keyset_order(sort_column, Land.id, descending)
 
-    if max_area is not None:
-        filters.append(Land.area <= max_area)
+    if format != "json":
+        content, count, last_value, last_id = await _binary_page(
+            db, format, filters, phases, order, sort_column, descending, offset, limit
+        )
+        binary = Response(content=content, media_type=FORMAT_MEDIA_TYPES[format])
+        if count == limit:
+            binary.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+                sort_by, descending, last_value, last_id, null_tail=_in_null_tail(sort_column, last_value)
+            )
+        return binary
 
-    # Apply filters
-    if filters:
-        query = query.filter(and_(*filters))
+    # The sort key is selected alongside each row to build the next cursor
+    query = select(Land) if sort_column is None else select(Land, sort_column)
+    query = query.where(*filters).order_by(*order).offset(offset)
+    rows = await _fetch_phases(db, query, phases, limit)
+    lands = [row[0] for row in rows]
 
-    # Execute query with pagination
-    lands = query.offset(offset).limit(limit).all()
+    if len(rows) == limit:
+        last_value = rows[-1][1] if sort_column is not None else None
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            sort_by, descending, last_value, lands[-1].id, null_tail=_in_null_tail(sort_column, last_value)
+        )
 
     return lands
 
 
+def _in_null_tail(sort_column, last_value) -> bool:
+    return sort_column is not None and last_value is None
+
+
+async def _fetch_phases(db: AsyncSession, query, phases: list, limit: int) -> list:
+    """Up to limit rows of an ordered query, reading each keyset phase in turn"""
+    rows = []
+    for phase in phases:
+        rows.extend((await db.execute(query.where(*phase).limit(limit - len(rows)))).all())
+        if len(rows) == limit:
+            break
+    return rows
+
+
+def _flatgeobuf_page(columns: list, filters: list, phases: list, order: list, has_sort_key: bool,
+                     descending: bool, offset: int, limit: int) -> tuple:
+    """
+    fetch_flatgeobuf arguments for a search page: (page, order_by, *extra)
+
+    With several keyset phases each is limited on its own and the first
+    limit rows of their union form the page, so every branch keeps its
+    index-ordered scan. The extra aggregates are the row count, then the
+    last row's sort key (only when has_sort_key) and id, taken from the
+    same aggregate pass by ordering the page in reverse.
+    """
+    branches = [
+        select(*columns, Land.geometry.label(GEOMETRY_COLUMN)).where(*filters, *phase)
+        .order_by(*order).offset(offset).limit(limit)
+        for phase in phases
+    ]
+    if len(branches) == 1:
+        page = branches[0].subquery("page")
+    else:
+        merged = union_all(*branches).subquery("phases")
+        merged_key = merged.c._sort_key if has_sort_key else None
+        page = select(merged).order_by(*keyset_order(merged_key, merged.c.id, descending))
+        page = page.limit(limit).subquery("page")
+
+    sort_key = page.c._sort_key if has_sort_key else None
+    reverse = keyset_order(sort_key, page.c.id, not descending)
+    extra = [func.count()]
+    if sort_key is not None:
+        extra.append(func.array_agg(aggregate_order_by(sort_key, *reverse))[1])
+    extra.append(func.array_agg(aggregate_order_by(page.c.id, *reverse))[1])
+
+    return (page, keyset_order(sort_key, page.c.id, descending), *extra)
+
+
+async def _binary_page(db: AsyncSession, format: str, filters: list, phases: list, order: list,
+                       sort_column, descending: bool, offset: int, limit: int):
+    """(content, row count, last sort value, last id) of a search page as FlatGeobuf or Arrow"""
+    columns = list(SEARCH_COLUMNS)
+    if sort_column is not None:
+        columns.append(sort_column.label("_sort_key"))
+
+    if format == "fgb":
+        has_sort_key = sort_column is not None
+        result = await fetch_flatgeobuf(
+            db, *_flatgeobuf_page(columns, filters, phases, order, has_sort_key, descending, offset, limit)
+        )
+        if not has_sort_key:
+            document, count, last_id = result
+            return document, count, None, last_id
+        return result
+
+    query = select(*columns, func.ST_AsBinary(Land.geometry).label(GEOMETRY_COLUMN)).where(*filters)
+    query = query.order_by(*order).offset(offset)
+    rows = await _fetch_phases(db, query, phases, limit)
+
+    last = rows[-1]._mapping if rows else {}
+    return arrow_stream(query, rows), len(rows), last.get("_sort_key"), last.get("id")
+
+
+@router.get("/export")
+async def export_lands(
+    criteria: SearchFilters = Depends(),
+    format: Literal["csv", "geojsonseq", "parquet"] = Query("csv", description="Export format")
+):
+    """
+    Export every parcel matching the search criteria
+
+    Rows are read through a server-side cursor and streamed in chunks, so
+    whole cities can be exported with constant server memory. Rows are in
+    id order. `csv` carries the geometry as WKT, `geojsonseq` is one
+    GeoJSON Feature per record (RFC 8142) and `parquet` is GeoParquet with
+    WKB geometry (needs pyarrow on the server).
+    """
+    if format == "parquet":
+        require_format_support("arrow")
+
+    if format == "csv":
+        query = select(*SEARCH_COLUMNS, func.ST_AsText(Land.geometry).label(GEOMETRY_COLUMN))
+        stream = csv_stream
+    elif format == "geojsonseq":
+        properties = func.json_build_object(*chain.from_iterable(
+            (column.name, column) for column in SEARCH_COLUMNS
+        ))
+        query = select(cast(func.json_build_object(
+            'type', 'Feature',
+            'geometry', cast(func.ST_AsGeoJSON(Land.geometry), JSON),
+            'properties', properties
+        ), Text).label("feature"))
+        stream = geojsonseq_stream
+    else:
+        query = select(*SEARCH_COLUMNS, func.ST_AsBinary(Land.geometry).label(GEOMETRY_COLUMN))
+        stream = parquet_stream
+
+    query = query.where(*criteria.conditions).order_by(Land.id)
+    extension, media_type = EXPORT_FORMATS[format]
+
+    return StreamingResponse(
+        stream(query, criteria.prepare),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="lands.{extension}"'}
+    )
+
+
+@router.get("/suggest", response_model=List[Suggestion])
+async def suggest(
+    q: str = Query(..., min_length=1, description="Prefix of a section name or parcel number"),
+    city: str = Query(None, description="Limit suggestions to a city"),
+    district: str = Query(None, description="Limit suggestions to a district"),
+    kind: Literal["all", "section", "parcel"] = Query("all", description="Suggestion type"),
+    limit: int = Query(default=10, ge=1, le=50, description="Maximum number of suggestions")
+):
+    """
+    Autocomplete section names (段小段) and parcel numbers (地號)
+
+    Served from an in-memory prefix index built at startup, so no query runs
+    per keystroke. When the dataset version changes the index is rebuilt in
+    the background. Returns 503 while the index is still loading.
+    """
+    typeahead_index.refresh(await get_dataset_version())
+    if not typeahead_index.ready:
+        raise HTTPException(status_code=503, detail="Suggestion index is loading")
+
+    return typeahead_index.suggest(q.strip(), city=city, district=district, kind=kind, limit=limit)
+
+
+@router.get("/gazetteer", response_model=List[GazetteerCity])
+async def get_gazetteer(db: AsyncSession = Depends(get_async_db)):
+    """
+    Get the full city → district → section hierarchy in one response
+
+    Every node carries its parcel count and bounding box
+    ([min_lng, min_lat, max_lng, max_lat]) for zoom-to. Served from memory;
+    reloaded from the gazetteer table when the dataset version changes.
+    """
+    version = await get_dataset_version(db)
+    if gazetteer.version != version:
+        await gazetteer.load(version, db)
+
+    return Response(content=gazetteer.payload, media_type="application/json")
+
+
 @router.get("/cities", response_model=List[str])
-async def get_cities(db: Session = Depends(get_db)):
+async def get_cities(db: AsyncSession = Depends(get_async_db)):
     """
     Get list of all cities in the database
     """
-    cities = db.query(Land.city).distinct().order_by(Land.city).all()
-    return [city[0] for city in cities if city[0]]
+    cities = (await db.execute(
+        select(Land.city).distinct().order_by(Land.city)
+    )).scalars().all()
+    return [city for city in cities if city]
 
 
 @router.get("/districts", response_model=List[str])
 async def get_districts(
     city: str = Query(None, description="Filter districts by city"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get list of districts, optionally filtered by city
     """
-    query = db.query(Land.district).distinct()
+    query = select(Land.district).distinct()
 
     if city:
-        query = query.filter(Land.city == city)
+        query = query.where(Land.city == city)
 
-    districts = query.order_by(Land.district).all()
-    return [district[0] for district in districts if district[0]]
+    districts = (await db.execute(query.order_by(Land.district))).scalars().all()
+    return [district for district in districts if district]
 
 
 @router.get("/sections", response_model=List[dict])
 async def get_sections(
     city: str = Query(None, description="Filter by city"),
     district: str = Query(None, description="Filter by district"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get list of sections with their codes and names
     """
-    query = db.query(
+    query = select(
         Land.section_code,
         Land.section_name
     ).distinct()
 
     if city:
-        query = query.filter(Land.city == city)
+        query = query.where(Land.city == city)
 
     if district:
-        query = query.filter(Land.district == district)
+        query = query.where(Land.district == district)
 
-    sections = query.order_by(Land.section_code).all()
+    sections = (await db.execute(query.order_by(Land.section_code))).all()
 
     return [
         {"section_code": s[0], "section_name": s[1]}
@@ -1,64 +1,96 @@
 """
 Statistics API endpoints
+
+Responses are read from rollup materialized views that the importer refreshes
+after each run. Pass `fresh=true` to aggregate the lands table live instead.
 """
 from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 
-from app.database import get_db
-from app.models import Land
+from app.database import get_async_db
+from app.models import Land, SummaryStatsRollup, CityStatsRollup, DistrictStatsRollup
 from app.schemas import StatsSummary, CityStats
 
 router = APIRouter()
 
+FRESH_DESCRIPTION = "Aggregate the lands table live instead of reading the rollup"
+
 
 @router.get("/summary", response_model=StatsSummary)
-async def get_summary_stats(db: Session = Depends(get_db)):
+async def get_summary_stats(
+    fresh: bool = Query(False, description=FRESH_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Get overall statistics summary
     """
-    # Get counts
-    total_lands = db.query(func.count(Land.id)).scalar()
-    total_area = db.query(func.sum(Land.area)).scalar() or 0
-    cities_count = db.query(func.count(func.distinct(Land.city))).scalar()
-    districts_count = db.query(func.count(func.distinct(Land.district))).scalar()
-
-    # Get average announced value (exclude nulls and zeros)
-    avg_announced_value = db.query(
-        func.avg(Land.announced_value)
-    ).filter(
-        Land.announced_value.isnot(None),
-        Land.announced_value > 0
-    ).scalar()
+    if fresh:
+        query = select(
+            func.count(Land.id).label('total_lands'),
+            func.sum(Land.area).label('total_area'),
+            func.count(func.distinct(Land.city)).label('cities_count'),
+            func.count(func.distinct(Land.district)).label('districts_count'),
+            # Average announced value excludes nulls and zeros
+            func.avg(Land.announced_value).filter(
+                Land.announced_value > 0
+            ).label('avg_announced_value')
+        )
+    else:
+        query = select(
+            SummaryStatsRollup.total_lands,
+            SummaryStatsRollup.total_area,
+            SummaryStatsRollup.cities_count,
+            SummaryStatsRollup.districts_count,
+            SummaryStatsRollup.avg_announced_value
+        )
+
+    r = (await db.execute(query)).first()
 
     return StatsSummary(
-        total_lands=total_lands,
-        total_area=float(total_area),
-        cities_count=cities_count,
-        districts_count=districts_count,
-        avg_announced_value=float(avg_announced_value) if avg_announced_value else None
+        total_lands=r.total_lands if r else 0,
+        total_area=float(r.total_area) if r and r.total_area else 0.0,
+        cities_count=r.cities_count if r else 0,
+        districts_count=r.districts_count if r else 0,
+        avg_announced_value=float(r.avg_announced_value) if r and r.avg_announced_value else None
     )
 
 
 @router.get("/by-city", response_model=List[CityStats])
-async def get_stats_by_city(db: Session = Depends(get_db)):
+async def get_stats_by_city(
+    fresh: bool = Query(False, description=FRESH_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Get statistics grouped by city
     """
-    results = db.query(
-        Land.city,
-        func.count(Land.id).label('land_count'),
-        func.sum(Land.area).label('total_area'),
-        func.avg(Land.area).label('avg_area'),
-        func.avg(Land.announced_value).label('avg_announced_value')
-    ).filter(
-        Land.city.isnot(None)
-    ).group_by(
-        Land.city
-    ).order_by(
-        func.count(Land.id).desc()
-    ).all()
+    if fresh:
+        query = select(
+            Land.city,
+            func.count(Land.id).label('land_count'),
+            func.sum(Land.area).label('total_area'),
+            func.avg(Land.area).label('avg_area'),
+            func.avg(Land.announced_value).label('avg_announced_value')
+        ).where(
+            Land.city.isnot(None)
+        ).group_by(
+            Land.city
+        ).order_by(
+            func.count(Land.id).desc()
+        )
+    else:
+        query = select(
+            CityStatsRollup.city,
+            CityStatsRollup.land_count,
+            CityStatsRollup.total_area,
+            CityStatsRollup.avg_area,
+            CityStatsRollup.avg_announced_value
+        ).order_by(
+            CityStatsRollup.land_count.desc()
+        )
+
+    results = (await db.execute(query)).all()
 
     return [
         CityStats(
@@ -75,31 +107,51 @@ async def get_stats_by_city(db: Session = Depends(get_db)):
 @router.get("/by-district", response_model=List[dict])
 async def get_stats_by_district(
     city: str = None,
-    db: Session = Depends(get_db)
+    fresh: bool = Query(False, description=FRESH_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get statistics grouped by district, optionally filtered by city
     """
-    query = db.query(
-        Land.city,
-        Land.district,
-        func.count(Land.id).label('land_count'),
-        func.sum(Land.area).label('total_area'),
-        func.avg(Land.area).label('avg_area')
-    ).filter(
-        Land.district.isnot(None)
-    )
+    if fresh:
+        query = select(
+            Land.city,
+            Land.district,
+            func.count(Land.id).label('land_count'),
+            func.sum(Land.area).label('total_area'),
+            func.avg(Land.area).label('avg_area')
+        ).where(
+            Land.district.isnot(None)
+        )
 
-    if city:
-        query = query.filter(Land.city == city)
+        if city:
+            query = query.where(Land.city == city)
+
+        query = query.group_by(
+            Land.city,
+            Land.district
+        ).order_by(
+            Land.city,
+            func.count(Land.id).desc()
+        )
+    else:
+        query = select(
+            DistrictStatsRollup.city,
+            DistrictStatsRollup.district,
+            DistrictStatsRollup.land_count,
+            DistrictStatsRollup.total_area,
+            DistrictStatsRollup.avg_area
+        )
+
+        if city:
+            query = query.where(DistrictStatsRollup.city == city)
+
+        query = query.order_by(
+            DistrictStatsRollup.city,
+            DistrictStatsRollup.land_count.desc()
+        )
 
-    results = query.group_by(
-        Land.city,
-        Land.district
-    ).order_by(
-        Land.city,
-        func.count(Land.id).desc()
-    ).all()
+    results = (await db.execute(query)).all()
 
     return [
         {
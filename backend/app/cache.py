@@ -0,0 +1,222 @@
+"""
+In-process caches shared by the API endpoints
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from urllib.parse import parse_qsl
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import DatasetVersion
+
+logger = logging.getLogger(__name__)
+
+
+class ByteBudgetCache:
+    """
+    Thread-safe LRU cache bounded by the total size of its values in bytes
+
+    Least recently used entries are evicted once the budget is exceeded.
+    Values larger than the whole budget are never stored.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, size: Optional[int] = None):
+        """Store value under key; size defaults to len(value)"""
+        if size is None:
+            size = len(value)
+
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Dataset version is re-read at most once per settings.dataset_version_ttl seconds
+_dataset_version: Optional[str] = None
+_dataset_version_checked_at = 0.0
+
+
+async def get_dataset_version(db: Optional[AsyncSession] = None) -> str:
+    """
+    Get the version stamp written by the importer at the end of each run
+
+    Cache entries are keyed by this value, so a new import invalidates them
+    without any explicit purge. Without db a short-lived session is opened
+    when the stamp needs re-reading.
+    """
+    global _dataset_version, _dataset_version_checked_at
+
+    now = time.monotonic()
+    if _dataset_version is None or now - _dataset_version_checked_at > settings.dataset_version_ttl:
+        query = select(DatasetVersion.version).where(DatasetVersion.id == 1)
+        if db is None:
+            async with AsyncSessionLocal() as session:
+                version = (await session.execute(query)).scalar()
+        else:
+            version = (await db.execute(query)).scalar()
+        _dataset_version = version or "0"
+        _dataset_version_checked_at = now
+
+    return _dataset_version
+
+
+# Encoded Mapbox Vector Tiles, keyed by (dataset_version, z, x, y)
+tile_cache = ByteBudgetCache(settings.tile_cache_max_bytes)
+
+
+# Whole HTTP responses of dataset-derived endpoints, keyed by
+# (dataset_version, path, query)
+response_cache = ByteBudgetCache(settings.response_cache_max_bytes)
+
+# GET endpoints whose answers only change when the importer runs
+CACHEABLE_PATH_PREFIXES = (
+    "/api/search/cities",
+    "/api/search/gazetteer",
+    "/api/search/districts",
+    "/api/search/sections",
+    "/api/stats/",
+)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ResponseCacheMiddleware:
+    """
+    Cache dataset-derived GET responses in memory, keyed by dataset version
+
+    Every cacheable response carries an ETag derived from the dataset version
+    and the request, so a matching If-None-Match is answered with 304 before
+    the endpoint (or the database) is reached. Requests with fresh=true
+    bypass the cache.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(CACHEABLE_PATH_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        query = sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True))
+        if ("fresh", "true") in query:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            version = await get_dataset_version()
+        except Exception:
+            logger.exception("Dataset version unavailable; serving uncached")
+            await self.app(scope, receive, send)
+            return
+
+        key = (version, scope["path"], tuple(query))
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:20]
+        etag = f'"{digest}"'
+        cache_headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", f"public, max-age={settings.response_cache_max_age}".encode()),
+        ]
+
+        request_headers = dict(scope["headers"])
+        if_none_match = request_headers.get(b"if-none-match")
+        if if_none_match and _etag_matches(if_none_match.decode("latin-1"), etag):
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        cached = response_cache.get(key)
+        if cached is not None:
+            headers, body = cached
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": headers + cache_headers + [(b"x-cache", b"HIT")],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start: Optional[Message] = None
+        chunks = []
+
+        async def capture(message: Message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = list(start.get("headers", []))
+            if start["status"] == 200:
+                response_cache.set(key, (headers, body), size=len(body))
+                headers = headers + cache_headers + [(b"x-cache", b"MISS")]
+
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, capture)
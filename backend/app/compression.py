@@ -0,0 +1,202 @@
+"""
+Negotiated gzip / brotli response compression
+
+Responses are compressed when the client accepts an encoding, the media
+type is compressible and the body reaches settings.compression_min_size.
+Streaming responses (bbox FeatureCollections, exports) are compressed chunk
+by chunk as they are produced. Brotli is offered only when the optional
+brotli package is installed.
+
+Every response with a compressible media type carries Vary: Accept-Encoding,
+including those sent uncompressed (no acceptable encoding, or a body below
+the threshold), so shared caches never serve one client's representation to
+another.
+
+Bodies of responses that carry an ETag (the response-cached endpoints) are
+kept compressed per encoding, so repeated hits cost no compression CPU.
+"""
+import zlib
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import ByteBudgetCache
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # Optional dependency: gzip only
+    brotli = None
+
+# Media types worth compressing (prefix match)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/geo+json",
+    "application/vnd.mapbox-vector-tile",
+    "application/flatgeobuf",
+    "application/vnd.apache.arrow.stream",
+    "text/",
+)
+
+# Encodings in server preference order, used to break q-value ties
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+compressed_cache = ByteBudgetCache(settings.compression_cache_max_bytes)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding for an Accept-Encoding header, or None"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _Compressor:
+    """Incremental compressor for one response body"""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=settings.compression_brotli_quality)
+            self.compress = compressor.process
+            self.finish = compressor.finish
+        else:
+            # wbits 31: gzip container
+            compressor = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+            self.compress = compressor.compress
+            self.finish = compressor.flush
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    compressor = _Compressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with the client's preferred encoding
+
+    Bodies smaller than the threshold and already encoded responses pass
+    through with only Vary added; non-compressible media types pass through
+    unchanged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+
+        start: Optional[Message] = None
+        pending: List[bytes] = []
+        pending_size = 0
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_start(compressed: bool, body_length: Optional[int] = None):
+            headers = MutableHeaders(raw=list(start["headers"]))
+            if "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if compressed:
+                headers["content-encoding"] = encoding
+                # The compressed body is a different representation
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["etag"] = f"W/{etag}"
+                if body_length is None:
+                    del headers["content-length"]
+                else:
+                    headers["content-length"] = str(body_length)
+            await send({**start, "headers": headers.raw})
+
+        async def send_wrapper(message: Message):
+            nonlocal start, pending_size, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start = message
+                headers = Headers(raw=start["headers"])
+                media_type = headers.get("content-type", "")
+                compressible = media_type.startswith(COMPRESSIBLE_TYPES)
+                passthrough = (
+                    encoding is None
+                    or "content-encoding" in headers
+                    or not compressible
+                    or start["status"] in (204, 304)
+                )
+                if passthrough:
+                    if compressible:
+                        await send_start(compressed=False)
+                    else:
+                        await send(message)
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                chunk = compressor.compress(body)
+                if not more_body:
+                    chunk += compressor.finish()
+                if chunk or not more_body:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            pending.append(body)
+            pending_size += len(body)
+
+            if not more_body and pending_size < settings.compression_min_size:
+                # Too small to be worth it
+                passthrough = True
+                await send_start(compressed=False)
+                await send({"type": "http.response.body", "body": b"".join(pending)})
+                return
+
+            if not more_body:
+                # Complete body in hand: compress in one go, reusing cached output
+                data = b"".join(pending)
+                etag = Headers(raw=start["headers"]).get("etag")
+                key = (etag, scope["path"], encoding) if etag else None
+                compressed = compressed_cache.get(key) if key else None
+                if compressed is None:
+                    compressed = compress(data, encoding)
+                    if key:
+                        compressed_cache.set(key, compressed)
+                await send_start(compressed=True, body_length=len(compressed))
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            if pending_size >= settings.compression_min_size:
+                # Streaming body past the threshold: compress from here on
+                compressor = _Compressor(encoding)
+                await send_start(compressed=True)
+                chunk = compressor.compress(b"".join(pending))
+                pending.clear()
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,39 +1,59 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+from app.metrics import InstrumentedAsyncPool, instrument_engine
+from app.slow_queries import instrument_slow_queries
 
-# Create database engine
-engine = create_engine(
-    settings.database_url,
+
+def _async_database_url(url: str) -> str:
+    """Point a postgresql:// URL (with or without a driver) at asyncpg"""
+    _, rest = url.split("://", 1)
+    return f"postgresql+asyncpg://{rest}"
+
+
+# Create async database engine (used by the API routers)
+async_engine = create_async_engine(
+    _async_database_url(settings.database_url),
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=False  # Set to True for SQL query logging
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    poolclass=InstrumentedAsyncPool,  # Records pool checkout wait time
+    echo=settings.sql_echo
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Query timing, row counts and pool gauges for /metrics
+instrument_engine(async_engine.sync_engine)
+
+# Slow statements with their EXPLAIN plans, served by /api/admin/slow-queries
+instrument_slow_queries(async_engine.sync_engine)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_async_db():
     """
-    Dependency function to get database session
+    Dependency function to get an async database session
 
     Usage in FastAPI:
         @app.get("/items/")
-        def read_items(db: Session = Depends(get_db)):
+        async def read_items(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Item))
             ...
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
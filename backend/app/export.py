@@ -0,0 +1,131 @@
+"""
+Streaming bulk export (CSV, GeoJSONSeq, Parquet)
+
+Each export opens its own session inside the response generator and reads
+through a server-side cursor (yield_per), encoding one partition of rows at
+a time, so memory stays flat no matter how many parcels match. The session
+and cursor are closed when the stream ends or the client disconnects.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.database import AsyncSessionLocal
+from app.formats import GEOMETRY_COLUMN, arrow_batch, arrow_schema, pa
+
+# Rows fetched per server-side cursor round trip (one encoded chunk each)
+EXPORT_CHUNK_SIZE = 2000
+
+# Rows per Parquet row group
+PARQUET_ROW_GROUP_SIZE = 50000
+
+# RFC 8142 record separator
+RECORD_SEPARATOR = b"\x1e"
+
+# GeoParquet file metadata for the WKB geometry column
+GEOPARQUET_METADATA = json.dumps({
+    "version": "1.1.0",
+    "primary_column": GEOMETRY_COLUMN,
+    "columns": {GEOMETRY_COLUMN: {"encoding": "WKB", "geometry_types": []}},
+}).encode()
+
+Prepare = Optional[Callable[[AsyncSession], Awaitable[None]]]
+
+
+async def _partitions(query: Select, prepare: Prepare) -> AsyncIterator[list]:
+    """Rows of query in EXPORT_CHUNK_SIZE lists from a server-side cursor"""
+    async with AsyncSessionLocal() as db:
+        if prepare is not None:
+            await prepare(db)
+        result = await db.stream(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        async for rows in result.partitions():
+            yield rows
+
+
+async def csv_stream(query: Select, prepare: Prepare = None) -> AsyncIterator[bytes]:
+    """UTF-8 CSV (with BOM, for Excel) with a header row of the column names"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    buffer.write("\ufeff")
+    writer.writerow(column.name for column in query.selected_columns)
+
+    async for rows in _partitions(query, prepare):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def geojsonseq_stream(query: Select, prepare: Prepare = None) -> AsyncIterator[bytes]:
+    """
+    GeoJSON text sequence (RFC 8142)
+
+    The query selects one column: a Feature serialized by PostgreSQL.
+    """
+    async for rows in _partitions(query, prepare):
+        yield b"".join(RECORD_SEPARATOR + row[0].encode() + b"\n" for row in rows)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting Parquet output until it is drained"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def parquet_stream(query: Select, prepare: Prepare = None) -> AsyncIterator[bytes]:
+    """
+    GeoParquet with WKB geometry
+
+    Batches are buffered up to PARQUET_ROW_GROUP_SIZE rows and written as
+    one row group, whose bytes are sent before the next is read.
+    """
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(query)
+    schema = schema.with_metadata({**(schema.metadata or {}), b"geo": GEOPARQUET_METADATA})
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    batches, buffered = [], 0
+
+    try:
+        async for rows in _partitions(query, prepare):
+            batches.append(arrow_batch(schema, query, rows))
+            buffered += len(rows)
+            if buffered >= PARQUET_ROW_GROUP_SIZE:
+                writer.write_table(pa.Table.from_batches(batches, schema=schema))
+                batches, buffered = [], 0
+                yield sink.drain()
+
+        if batches:
+            writer.write_table(pa.Table.from_batches(batches, schema=schema))
+    finally:
+        writer.close()
+
+    yield sink.drain()
@@ -0,0 +1,118 @@
+"""
+Binary feature output formats: FlatGeobuf and Arrow IPC
+
+Both formats take a page query whose columns become feature properties and
+whose "geometry" column holds the PostGIS geometry. Columns named with a
+leading underscore (e.g. a sort key kept for the next cursor) are helpers
+and are not written out.
+
+FlatGeobuf is produced entirely by PostGIS (ST_AsFlatGeobuf). Arrow IPC
+streams carry the geometry as WKB from ST_AsBinary in a binary column tagged
+with the geoarrow.wkb extension, so pyarrow / GeoPandas read them without
+parsing any text.
+"""
+from typing import List, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import Boolean, DateTime, Float, Integer, Numeric, func, select, true
+from sqlalchemy.sql import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+try:
+    import pyarrow as pa
+except ImportError:  # Optional dependency: format=arrow is unavailable
+    pa = None
+
+FORMAT_MEDIA_TYPES = {
+    "fgb": "application/flatgeobuf",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+GEOMETRY_COLUMN = "geometry"
+
+# GeoArrow extension metadata for WKB in lng/lat order
+GEOARROW_WKB_METADATA = {
+    b"ARROW:extension:name": b"geoarrow.wkb",
+    b"ARROW:extension:metadata": b'{"crs":"OGC:CRS84","crs_type":"authority_code"}',
+}
+
+
+def _is_helper(name: str) -> bool:
+    return name.startswith("_")
+
+
+def require_format_support(format: str):
+    """Reject format=arrow up front when pyarrow is not installed"""
+    if format == "arrow" and pa is None:
+        raise HTTPException(status_code=501, detail="format=arrow needs pyarrow installed on the server")
+
+
+def flatgeobuf_select(page, order_by: Sequence = (), *extra) -> Select:
+    """
+    SELECT of one FlatGeobuf document over the rows of a page subquery
+
+    Features are aggregated in order_by order; extra aggregates over the
+    page (e.g. the last row's sort key) are returned alongside.
+    """
+    feature = select(*[c for c in page.c if not _is_helper(c.name)]).correlate(page).lateral("feature")
+    document = func.ST_AsFlatGeobuf(feature.table_valued(), False, GEOMETRY_COLUMN)
+    if order_by:
+        document = document.aggregate_order_by(*order_by)
+    return select(document, *extra).select_from(page.join(feature, true()))
+
+
+def _arrow_type(sql_type):
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if sql_type.timezone else None)
+    return pa.string()
+
+
+def arrow_schema(query: Select):
+    """
+    Arrow schema for the rows of query
+
+    The query's "geometry" column must be WKB (ST_AsBinary); property column
+    types come from the SQL column types. Helper columns are left out.
+    """
+    fields = []
+    for column in query.selected_columns:
+        if _is_helper(column.name):
+            continue
+        if column.name == GEOMETRY_COLUMN:
+            fields.append(pa.field(column.name, pa.binary(), metadata=GEOARROW_WKB_METADATA))
+        else:
+            fields.append(pa.field(column.name, _arrow_type(column.type)))
+    return pa.schema(fields)
+
+
+def arrow_batch(schema, query: Select, rows: List):
+    """Record batch of rows fetched with query, matching arrow_schema(query)"""
+    names = [column.name for column in query.selected_columns]
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    by_name = dict(zip(names, columns))
+    return pa.record_batch(
+        [pa.array(by_name[field.name], type=field.type) for field in schema],
+        schema=schema
+    )
+
+
+def arrow_stream(query: Select, rows: List) -> bytes:
+    """Arrow IPC stream of rows fetched with query"""
+    schema = arrow_schema(query)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(arrow_batch(schema, query, rows))
+    return sink.getvalue().to_pybytes()
+
+
+async def fetch_flatgeobuf(db: AsyncSession, page, order_by: Sequence = (), *extra) -> tuple:
+    """(document, *extra) for a page subquery; the document is b"" when PostGIS returns NULL"""
+    row = (await db.execute(flatgeobuf_select(page, order_by, *extra))).first()
+    document = bytes(row[0]) if row[0] is not None else b""
+    return (document, *row[1:])
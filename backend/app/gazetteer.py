@@ -0,0 +1,82 @@
+"""
+In-memory administrative gazetteer (city → district → section)
+
+The importer writes a flat gazetteer table; this module assembles it into a
+tree once and keeps the serialized JSON, so the whole hierarchy is served
+without a query. The tree is rebuilt when the dataset version changes.
+"""
+import logging
+from typing import Optional
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models import GazetteerNode
+
+logger = logging.getLogger(__name__)
+
+
+def _bbox(node: GazetteerNode) -> Optional[list]:
+    if node.min_lng is None:
+        return None
+    return [node.min_lng, node.min_lat, node.max_lng, node.max_lat]
+
+
+class Gazetteer:
+    """Hierarchical city/district/section tree with counts and extents"""
+
+    def __init__(self):
+        self.version: Optional[str] = None
+        self.payload: bytes = b"[]"
+
+    async def load(self, version: str, db: Optional[AsyncSession] = None):
+        """Read the gazetteer table and rebuild the serialized tree"""
+        query = select(GazetteerNode).order_by(
+            GazetteerNode.city,
+            GazetteerNode.district.nullsfirst(),
+            GazetteerNode.section_code.nullsfirst()
+        )
+
+        if db is None:
+            async with AsyncSessionLocal() as session:
+                nodes = (await session.execute(query)).scalars().all()
+        else:
+            nodes = (await db.execute(query)).scalars().all()
+
+        cities = {}
+        districts = {}
+
+        # Parents sort before their children, so each node's parent exists
+        for node in nodes:
+            if node.level == "city":
+                cities[node.city] = {
+                    "city": node.city,
+                    "parcel_count": node.parcel_count,
+                    "bbox": _bbox(node),
+                    "districts": [],
+                }
+            elif node.level == "district":
+                district = {
+                    "district": node.district,
+                    "parcel_count": node.parcel_count,
+                    "bbox": _bbox(node),
+                    "sections": [],
+                }
+                districts[(node.city, node.district)] = district
+                cities[node.city]["districts"].append(district)
+            else:
+                districts[(node.city, node.district)]["sections"].append({
+                    "section_code": node.section_code,
+                    "section_name": node.section_name,
+                    "parcel_count": node.parcel_count,
+                    "bbox": _bbox(node),
+                })
+
+        self.payload = orjson.dumps(list(cities.values()))
+        self.version = version
+        logger.info(f"Gazetteer loaded: {len(cities)} cities, {len(districts)} districts (version {version})")
+
+
+gazetteer = Gazetteer()
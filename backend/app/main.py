@@ -1,19 +1,61 @@
 """
 FastAPI application main entry point
 """
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.api import lands, search, stats
+from app.api import admin, lands, search, stats
+from app.cache import ResponseCacheMiddleware, get_dataset_version, response_cache, tile_cache
+from app.compression import CompressionMiddleware, compressed_cache
+from app.gazetteer import gazetteer
+from app.metrics import MetricsMiddleware, register_cache, render_metrics
+from app.pagination import NEXT_CURSOR_HEADER
+from app.typeahead import typeahead_index
+
+logger = logging.getLogger(__name__)
+
+
+async def _load_indexes():
+    try:
+        await gazetteer.load(await get_dataset_version())
+    except Exception:
+        logger.exception("Failed to load gazetteer")
+
+    try:
+        # Builds in the background; /api/search/suggest also calls refresh on version changes
+        typeahead_index.refresh(await get_dataset_version())
+    except Exception:
+        logger.exception("Failed to build typeahead index")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build in-memory indexes in the background so startup is not delayed"""
+    task = asyncio.create_task(_load_indexes())
+    yield
+    task.cancel()
+
 
 # Create FastAPI application
 app = FastAPI(
     title=settings.api_title,
     version=settings.api_version,
-    description=settings.api_description
+    description=settings.api_description,
+    lifespan=lifespan
 )
 
+# Cache dataset-derived GET responses (ETag / conditional GET)
+# Added before CORS so cached and 304 responses still get CORS headers
+app.add_middleware(ResponseCacheMiddleware)
+
+# gzip / brotli; outside the response cache so it stores uncompressed bodies
+app.add_middleware(CompressionMiddleware)
+
 # Configure CORS
 # Support both string (comma-separated) and list formats
 cors_origins = settings.cors_origins
@@ -26,8 +68,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Time every request, including cache hits and CORS preflights (outermost)
+app.add_middleware(MetricsMiddleware)
+
+register_cache("tile", tile_cache)
+register_cache("response", response_cache)
+register_cache("compressed", compressed_cache)
+
 
 # Health check endpoint
 @app.get("/", tags=["Health"])
@@ -46,10 +96,18 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: request and SQL latency by route, pool usage, cache hits"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 # Include routers
 app.include_router(lands.router, prefix="/api/lands", tags=["Lands"])
 app.include_router(search.router, prefix="/api/search", tags=["Search"])
 app.include_router(stats.router, prefix="/api/stats", tags=["Statistics"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,190 @@
+"""
+Prometheus metrics for requests, SQL queries and the connection pool
+
+Request timing comes from an ASGI middleware. SQL time and row counts come
+from cursor execute events and are labelled with the route of the request
+that issued them, so a slow endpoint can be split into database time and
+the rest (serialization, Python work). Pool gauges and the checkout wait
+histogram show pool starvation. Everything is served on /metrics.
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow exports
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for queries issued outside a request (startup index loads)
+BACKGROUND_ROUTE = "background"
+
+# Route labels for requests that never reached routing: answered by the
+# response cache (hit or 304), or matched no route
+CACHED_ROUTE = "cached"
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start until the last response byte is sent",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Total SQL execution time spent by one request",
+    ["route"],
+    buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled"
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ["route"],
+    buckets=LATENCY_BUCKETS
+)
+QUERY_ROWS = Counter(
+    "db_query_rows_total",
+    "Rows returned or affected by SQL statements (server-side cursors excluded)",
+    ["route"]
+)
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time to obtain a connection from the pool, including opening new ones",
+    buckets=LATENCY_BUCKETS
+)
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size")
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out")
+POOL_CHECKED_IN = Gauge("db_pool_checked_in", "Idle connections in the pool")
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size (negative while below it)")
+CACHE_HITS = Gauge("cache_hits", "Hits of an in-process cache", ["cache"])
+CACHE_MISSES = Gauge("cache_misses", "Misses of an in-process cache", ["cache"])
+
+
+class _RequestState:
+    """Per-request values shared between the middleware and the cursor hooks"""
+
+    __slots__ = ("scope", "db_seconds", "cached")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.db_seconds = 0.0
+        self.cached = False
+
+    @property
+    def route(self) -> str:
+        # FastAPI stores the matched route in the scope during routing
+        route = self.scope.get("route")
+        if route is not None:
+            return route.path
+        return CACHED_ROUTE if self.cached else UNMATCHED_ROUTE
+
+
+_current_request: ContextVar[Optional[_RequestState]] = ContextVar("current_request", default=None)
+
+
+def current_route() -> str:
+    """Route label of the request being handled (BACKGROUND_ROUTE outside requests)"""
+    request = _current_request.get()
+    return request.route if request else BACKGROUND_ROUTE
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine):
+    """Attach query timing hooks and pool gauges to an engine (async_engine.sync_engine for asyncio)"""
+    pool = engine.pool
+
+    POOL_SIZE.set_function(pool.size)
+    POOL_CHECKED_OUT.set_function(pool.checkedout)
+    POOL_CHECKED_IN.set_function(pool.checkedin)
+    POOL_OVERFLOW.set_function(pool.overflow)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+        request = _current_request.get()
+        route = request.route if request else BACKGROUND_ROUTE
+        if request:
+            request.db_seconds += elapsed
+
+        QUERY_DURATION.labels(route).observe(elapsed)
+        if cursor.rowcount >= 0:
+            QUERY_ROWS.labels(route).inc(cursor.rowcount)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        # Keep the start-time stack balanced when a statement fails
+        starts = context.connection.info.get("query_start") if context.connection else None
+        if starts:
+            starts.pop()
+
+
+def register_cache(name: str, cache):
+    """Export a ByteBudgetCache's hit and miss counters"""
+    CACHE_HITS.labels(name).set_function(lambda: cache.hits)
+    CACHE_MISSES.labels(name).set_function(lambda: cache.misses)
+
+
+def render_metrics() -> tuple:
+    """(body, content type) of the Prometheus text exposition"""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request by method, route and status
+
+    Streaming responses are timed until their last chunk is sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = _RequestState(scope)
+        token = _current_request.set(state)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                state.cached = status == 304 or (b"x-cache", b"HIT") in message.get("headers", [])
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            _current_request.reset(token)
+            route = state.route
+            REQUEST_DURATION.labels(scope["method"], route, str(status)).observe(time.perf_counter() - start)
+            REQUEST_DB_TIME.labels(route).observe(state.db_seconds)
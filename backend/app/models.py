@@ -2,7 +2,8 @@
 SQLAlchemy database models
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Numeric, DateTime
+from sqlalchemy import Column, Integer, SmallInteger, String, Numeric, Float, DateTime
+from sqlalchemy.orm import deferred
 from geoalchemy2 import Geometry
 
 from app.database import Base
@@ -33,7 +34,89 @@ class Land(Base):
     declared_land_price = Column(Integer)  # 申報地價
     manager_name = Column(String(200))  # 管理者名稱
     geometry = Column(Geometry(geometry_type='POLYGON', srid=4326))  # 地理邊界
+    # Simplified copies filled by the importer, used for low-zoom map payloads
+    geometry_low = deferred(Column(Geometry(geometry_type='POLYGON', srid=4326)))  # 簡化邊界（zoom <= 12）
+    geometry_medium = deferred(Column(Geometry(geometry_type='POLYGON', srid=4326)))  # 簡化邊界（zoom 13-14）
+    source_file = deferred(Column(String(255)))  # 來源檔案
     created_at = Column(DateTime, default=datetime.now)  # 建立時間
 
     def __repr__(self):
         return f"<Land(id={self.id}, city={self.city}, district={self.district}, parcel_no={self.parcel_no})>"
+
+
+class LandCluster(Base):
+    """Precomputed grid cell aggregate for low zoom levels"""
+
+    __tablename__ = "land_clusters"
+
+    zoom = Column(SmallInteger, primary_key=True)  # 地圖縮放層級
+    cell_x = Column(Integer, primary_key=True)  # 網格欄
+    cell_y = Column(Integer, primary_key=True)  # 網格列
+    parcel_count = Column(Integer, nullable=False)  # 土地筆數
+    total_area = Column(Numeric(18, 2))  # 總面積（平方公尺）
+    centroid = Column(Geometry(geometry_type='POINT', srid=4326))  # 網格內土地中心點
+
+
+class GazetteerNode(Base):
+    """City, district or section node with parcel count and extent"""
+
+    __tablename__ = "gazetteer"
+
+    id = Column(Integer, primary_key=True)
+    level = Column(String(10), nullable=False)  # city / district / section
+    city = Column(String(50), nullable=False)  # 縣市
+    district = Column(String(50))  # 鄉鎮市區
+    section_code = Column(String(10))  # 段代碼
+    section_name = Column(String(100))  # 段小段名稱
+    parcel_count = Column(Integer, nullable=False)  # 土地筆數
+    min_lng = Column(Float)
+    min_lat = Column(Float)
+    max_lng = Column(Float)
+    max_lat = Column(Float)
+
+
+class SummaryStatsRollup(Base):
+    """Overall statistics (materialized view refreshed by the importer)"""
+
+    __tablename__ = "stats_summary"
+
+    id = Column(Integer, primary_key=True)  # Always 1
+    total_lands = Column(Integer)  # 土地筆數
+    total_area = Column(Numeric)  # 總面積
+    cities_count = Column(Integer)  # 縣市數
+    districts_count = Column(Integer)  # 鄉鎮市區數
+    avg_announced_value = Column(Numeric)  # 平均公告現值
+
+
+class CityStatsRollup(Base):
+    """Per-city statistics (materialized view refreshed by the importer)"""
+
+    __tablename__ = "stats_by_city"
+
+    city = Column(String(50), primary_key=True)  # 縣市
+    land_count = Column(Integer)  # 土地筆數
+    total_area = Column(Numeric)  # 總面積
+    avg_area = Column(Numeric)  # 平均面積
+    avg_announced_value = Column(Numeric)  # 平均公告現值
+
+
+class DistrictStatsRollup(Base):
+    """Per-district statistics (materialized view refreshed by the importer)"""
+
+    __tablename__ = "stats_by_district"
+
+    city = Column(String(50), primary_key=True)  # 縣市
+    district = Column(String(50), primary_key=True)  # 鄉鎮市區
+    land_count = Column(Integer)  # 土地筆數
+    total_area = Column(Numeric)  # 總面積
+    avg_area = Column(Numeric)  # 平均面積
+
+
+class DatasetVersion(Base):
+    """Single-row version stamp written by the importer after each run"""
+
+    __tablename__ = "dataset_version"
+
+    id = Column(SmallInteger, primary_key=True, default=1)
+    version = Column(String(64), nullable=False)  # 資料版本
+    updated_at = Column(DateTime, default=datetime.now)  # 更新時間
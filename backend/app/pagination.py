@@ -0,0 +1,92 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is an opaque URL-safe token holding the sort key and id of the
+last row on a page. The next page starts strictly after that row, so
+PostgreSQL can seek on a (sort_key, id) index instead of scanning and
+discarding every skipped row the way OFFSET does.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, tuple_
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_by: str, descending: bool, last_value: Any, last_id: int,
+                  null_tail: bool = False) -> str:
+    """
+    Build the cursor token pointing just past the given row
+
+    null_tail marks a row whose sort key is NULL, i.e. one in the block of
+    NULL keys that follows (ascending) or precedes (descending) the rest.
+    """
+    payload = {"s": sort_by, "d": descending, "v": last_value, "id": last_id}
+    if null_tail:
+        payload["n"] = True
+    raw = json.dumps(payload, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> Tuple[Any, int, bool]:
+    """
+    Decode a cursor token into (last_value, last_id, null_tail)
+
+    Raises HTTP 400 if the token is malformed or was issued for a different
+    sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        last_value, last_id = payload["v"], int(payload["id"])
+        null_tail = bool(payload.get("n", False))
+        issued_for = (payload["s"], payload["d"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if issued_for != (sort_by, descending):
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort order")
+
+    return last_value, last_id, null_tail
+
+
+def keyset_order(sort_column, id_column, descending: bool) -> list:
+    """
+    ORDER BY clauses matching keyset_conditions
+
+    PostgreSQL defaults are kept (NULLS LAST ascending, NULLS FIRST
+    descending) so a plain (sort_key, id) b-tree serves both directions.
+    """
+    columns = [id_column] if sort_column is None else [sort_column, id_column]
+    return [c.desc() if descending else c.asc() for c in columns]
+
+
+def keyset_conditions(sort_column, id_column, last_value: Optional[Any], last_id: int,
+                      descending: bool, null_tail: bool = False) -> list:
+    """
+    WHERE clauses selecting the rows after (last_value, last_id) in keyset_order
+
+    Rows with a NULL sort key form a separate block, so there is one clause
+    per block still ahead, in page order: the rest of the current block,
+    then (if any) the whole next one. Each clause is a single row
+    comparison or IS [NOT] NULL test that PostgreSQL can use as an index
+    condition for an ordered (sort_key, id) scan; a page reads the blocks
+    in turn until it is full.
+    """
+    if sort_column is None:
+        return [id_column < last_id if descending else id_column > last_id]
+
+    if null_tail:
+        rest = and_(sort_column.is_(None), id_column < last_id if descending else id_column > last_id)
+        # Descending, the non-NULL keys follow the NULL block
+        return [rest, sort_column.isnot(None)] if descending else [rest]
+
+    if descending:
+        return [tuple_(sort_column, id_column) < tuple_(last_value, last_id)]
+    # Ascending, the NULL block follows the non-NULL keys
+    return [tuple_(sort_column, id_column) > tuple_(last_value, last_id), sort_column.is_(None)]
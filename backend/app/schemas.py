@@ -45,6 +45,31 @@ class LandDetailResponse(LandResponse):
     geometry: Optional[dict] = None  # GeoJSON geometry
 
 
+class NearbyLandResponse(LandResponse):
+    """Land response with the distance to a query point"""
+
+    distance: float  # Meters, 0 inside the parcel
+
+
+# Most ids accepted by POST /api/lands/batch
+MAX_BATCH_IDS = 500
+
+
+class LandBatchRequest(BaseModel):
+    """Batch parcel lookup"""
+
+    ids: list[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS, description="Land ids")
+    fields: Optional[list[str]] = Field(None, description="Attributes to return (default: all); id is always included")
+    include_geometry: bool = Field(False, description="Include the GeoJSON geometry")
+
+
+class LandBatchResponse(BaseModel):
+    """Batch parcel lookup result, in request order"""
+
+    lands: list[dict[str, Any]]
+    missing: list[int]  # Requested ids that do not exist
+
+
 class GeoJSONFeature(BaseModel):
     """GeoJSON Feature"""
 
@@ -85,6 +110,45 @@ class SearchQuery(BaseModel):
     offset: int = Field(default=0, ge=0, description="Result offset for pagination")
 
 
+class Suggestion(BaseModel):
+    """Typeahead suggestion (section or parcel)"""
+
+    type: str  # "section" or "parcel"
+    city: Optional[str] = None
+    district: Optional[str] = None
+    section_code: Optional[str] = None
+    section_name: Optional[str] = None
+    parcel_no: Optional[str] = None
+    id: Optional[int] = None  # Land id (parcel suggestions only)
+
+
+class GazetteerSection(BaseModel):
+    """Gazetteer section node"""
+
+    section_code: str
+    section_name: Optional[str] = None
+    parcel_count: int
+    bbox: Optional[list[float]] = None  # [min_lng, min_lat, max_lng, max_lat]
+
+
+class GazetteerDistrict(BaseModel):
+    """Gazetteer district node"""
+
+    district: str
+    parcel_count: int
+    bbox: Optional[list[float]] = None
+    sections: list[GazetteerSection]
+
+
+class GazetteerCity(BaseModel):
+    """Gazetteer city node"""
+
+    city: str
+    parcel_count: int
+    bbox: Optional[list[float]] = None
+    districts: list[GazetteerDistrict]
+
+
 class StatsSummary(BaseModel):
     """Statistics summary"""
 
@@ -103,3 +167,15 @@ class CityStats(BaseModel):
     total_area: float
     avg_area: float
     avg_announced_value: Optional[float] = None
+
+
+class SlowQuery(BaseModel):
+    """Captured slow SQL statement"""
+
+    captured_at: datetime
+    route: str
+    duration_ms: float
+    statement: str
+    parameters: Optional[Any] = None
+    plan: Optional[str] = None  # EXPLAIN (ANALYZE, BUFFERS) output
+    explain_error: Optional[str] = None
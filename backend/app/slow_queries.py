@@ -0,0 +1,151 @@
+"""
+Slow query log with automatic EXPLAIN plans
+
+Statements that take at least settings.slow_query_threshold_ms are kept in
+a bounded ring buffer with their bound parameters and the route that issued
+them. SELECTs are re-run once under EXPLAIN (ANALYZE, BUFFERS) on the same
+connection, inside a savepoint, so the plan uses the same parameters and a
+failed EXPLAIN cannot abort the request's transaction. The re-run adds the
+query time again to that one request; a statement is explained at most once
+per settings.slow_query_explain_interval seconds.
+"""
+import logging
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.metrics import current_route
+
+logger = logging.getLogger(__name__)
+
+# Longest parameter string kept in a log entry
+MAX_PARAMETER_LENGTH = 200
+
+# Cap on remembered statements for the EXPLAIN interval
+MAX_EXPLAINED_STATEMENTS = 1000
+
+_DATA_MODIFYING = re.compile(r"\b(insert|update|delete|merge)\b", re.IGNORECASE)
+
+
+def _is_read_only(statement: str) -> bool:
+    """True for SELECTs and WITH queries without data-modifying statements"""
+    head = statement.lstrip()[:6].lower()
+    if head == "select":
+        return True
+    return head.startswith("with") and not _DATA_MODIFYING.search(statement)
+
+
+def _jsonable(value):
+    """Bound parameter as a JSON-safe, length-limited value"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    text = str(value)
+    return text if len(text) <= MAX_PARAMETER_LENGTH else text[:MAX_PARAMETER_LENGTH] + "..."
+
+
+def _explain(conn, statement: str, parameters) -> Tuple[Optional[str], Optional[str]]:
+    """(plan, error) of EXPLAIN (ANALYZE, BUFFERS) for a statement on conn's DBAPI connection"""
+    # A separate cursor: the original one still holds the result rows
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return None, str(e)
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan, None
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    """Bounded, newest-last buffer of slow statements"""
+
+    def __init__(self, max_entries: int):
+        self._entries = deque(maxlen=max_entries)
+        self._explained_at = {}
+
+    def entries(self) -> List[dict]:
+        """Captured statements, newest first"""
+        return list(reversed(self._entries))
+
+    def clear(self):
+        self._entries.clear()
+        self._explained_at.clear()
+
+    def _should_explain(self, statement: str) -> bool:
+        now = time.monotonic()
+        last = self._explained_at.get(statement)
+        if last is not None and now - last < settings.slow_query_explain_interval:
+            return False
+
+        if len(self._explained_at) >= MAX_EXPLAINED_STATEMENTS:
+            self._explained_at.clear()
+        self._explained_at[statement] = now
+        return True
+
+    def capture(self, conn, statement: str, parameters, context, executemany: bool, duration_ms: float):
+        plan = explain_error = None
+
+        if (
+            settings.slow_query_explain
+            and not executemany
+            # Server-side cursors are still open on the connection
+            and not (context is not None and context.execution_options.get("stream_results"))
+            and _is_read_only(statement)
+            and self._should_explain(statement)
+        ):
+            try:
+                plan, explain_error = _explain(conn, statement, parameters)
+            except Exception as e:
+                logger.exception("EXPLAIN of slow query failed")
+                explain_error = str(e)
+
+        self._entries.append({
+            "captured_at": datetime.now(timezone.utc),
+            "route": current_route(),
+            "duration_ms": round(duration_ms, 1),
+            "statement": statement,
+            "parameters": _jsonable(parameters),
+            "plan": plan,
+            "explain_error": explain_error,
+        })
+
+
+slow_query_log = SlowQueryLog(settings.slow_query_log_size)
+
+
+def instrument_slow_queries(engine: Engine):
+    """Capture statements slower than the threshold into slow_query_log"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["slow_query_start"].pop()) * 1000
+        threshold = settings.slow_query_threshold_ms
+        if threshold > 0 and duration_ms >= threshold:
+            slow_query_log.capture(conn, statement, parameters, context, executemany, duration_ms)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        starts = context.connection.info.get("slow_query_start") if context.connection else None
+        if starts:
+            starts.pop()
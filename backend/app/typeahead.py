@@ -0,0 +1,190 @@
+"""
+In-memory typeahead index for section names and parcel numbers
+
+Built at startup from the lands table and rebuilt in the background when the
+dataset version changes (a bulk reload reassigns parcel ids). Each
+(city, district) scope keeps its keys in sorted Python lists, so a prefix
+lookup is a bisect plus a short forward scan and never touches the database.
+"""
+import asyncio
+import heapq
+import logging
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models import Land
+
+logger = logging.getLogger(__name__)
+
+_match_key = itemgetter(0)
+
+
+def _first_match(keys: List[str], prefix: str) -> int:
+    """Position of the first key starting with prefix, or len(keys) if none"""
+    i = bisect_left(keys, prefix)
+    return i if i < len(keys) and keys[i].startswith(prefix) else len(keys)
+
+
+class _ScopeIndex:
+    """Sorted keys for one (city, district) scope"""
+
+    __slots__ = (
+        "city", "district",
+        "section_names", "section_codes",
+        "parcel_nos", "parcel_ids", "parcel_sections"
+    )
+
+    def __init__(self, city: str, district: str, sections: Dict[str, str], parcels: List[Tuple[str, int, str]]):
+        self.city = city
+        self.district = district
+
+        # Sections sorted by name; parcels point into this list by position
+        ordered = sorted(sections.items(), key=lambda item: (item[1], item[0]))
+        self.section_codes = [code for code, _ in ordered]
+        self.section_names = [name for _, name in ordered]
+        position = {code: i for i, code in enumerate(self.section_codes)}
+
+        parcels.sort()
+        self.parcel_nos = [sys.intern(parcel_no) for parcel_no, _, _ in parcels]
+        self.parcel_ids = array("l", (land_id for _, land_id, _ in parcels))
+        self.parcel_sections = array("l", (position[code] for _, _, code in parcels))
+
+    def iter_sections(self, prefix: str) -> Iterator[Tuple[str, dict]]:
+        names = self.section_names
+        i = _first_match(names, prefix)
+        while i < len(names) and names[i].startswith(prefix):
+            yield names[i], {
+                "type": "section",
+                "city": self.city,
+                "district": self.district,
+                "section_code": self.section_codes[i],
+                "section_name": names[i],
+            }
+            i += 1
+
+    def iter_parcels(self, prefix: str) -> Iterator[Tuple[str, dict]]:
+        keys = self.parcel_nos
+        i = _first_match(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            section = self.parcel_sections[i]
+            yield keys[i], {
+                "type": "parcel",
+                "city": self.city,
+                "district": self.district,
+                "section_code": self.section_codes[section],
+                "section_name": self.section_names[section],
+                "parcel_no": keys[i],
+                "id": self.parcel_ids[i],
+            }
+            i += 1
+
+
+class TypeaheadIndex:
+    """Prefix index over section names and parcel numbers, scoped by city/district"""
+
+    def __init__(self):
+        self.ready = False
+        self.size = 0
+        self.version: Optional[str] = None
+        self._scopes: Dict[Tuple[str, str], _ScopeIndex] = {}
+        self._reload: Optional[asyncio.Task] = None
+
+    def refresh(self, version: str):
+        """
+        Rebuild the index in the background if it was built for another dataset version
+
+        The current index keeps answering until the new one replaces it. At
+        most one rebuild runs at a time.
+        """
+        if version == self.version or (self._reload is not None and not self._reload.done()):
+            return
+        self._reload = asyncio.create_task(self._load_logged(version))
+
+    async def _load_logged(self, version: str):
+        try:
+            await self.load(version)
+        except Exception:
+            logger.exception("Failed to rebuild typeahead index")
+
+    async def load(self, version: str):
+        """Read every parcel key from the database and (re)build the index for version"""
+        query = select(
+            Land.city,
+            Land.district,
+            Land.section_code,
+            Land.section_name,
+            Land.parcel_no,
+            Land.id
+        ).where(
+            Land.section_code.isnot(None),
+            Land.parcel_no.isnot(None)
+        )
+
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(query)).all()
+
+        # Sorting 381k keys is CPU-bound; keep it off the event loop
+        await asyncio.to_thread(self._build, rows)
+        self.version = version
+        logger.info(
+            f"Typeahead index ready: {self.size} parcels in {len(self._scopes)} districts (version {version})"
+        )
+
+    def _build(self, rows):
+        sections = defaultdict(dict)
+        parcels = defaultdict(list)
+
+        for city, district, section_code, section_name, parcel_no, land_id in rows:
+            scope = (city or "", district or "")
+            sections[scope][section_code] = section_name or section_code
+            parcels[scope].append((parcel_no, land_id, section_code))
+
+        self._scopes = {
+            scope: _ScopeIndex(scope[0], scope[1], sections[scope], parcels[scope])
+            for scope in sorted(sections)
+        }
+        self.size = len(rows)
+        self.ready = True
+
+    def suggest(
+        self,
+        prefix: str,
+        city: Optional[str] = None,
+        district: Optional[str] = None,
+        kind: str = "all",
+        limit: int = 10
+    ) -> List[dict]:
+        """
+        Return up to limit suggestions whose key starts with prefix
+
+        Sections come before parcels; each group is sorted by key across all
+        matching scopes.
+        """
+        scopes = [
+            scope for (scope_city, scope_district), scope in self._scopes.items()
+            if (not city or scope_city == city) and (not district or scope_district == district)
+        ]
+
+        results = []
+        if kind in ("all", "section"):
+            hits = [s for s in scopes if _first_match(s.section_names, prefix) < len(s.section_names)]
+            matches = heapq.merge(*(s.iter_sections(prefix) for s in hits), key=_match_key)
+            results.extend(payload for _, payload in islice(matches, limit))
+
+        if kind in ("all", "parcel") and len(results) < limit:
+            hits = [s for s in scopes if _first_match(s.parcel_nos, prefix) < len(s.parcel_nos)]
+            matches = heapq.merge(*(s.iter_parcels(prefix) for s in hits), key=_match_key)
+            results.extend(payload for _, payload in islice(matches, limit - len(results)))
+
+        return results
+
+
+typeahead_index = TypeaheadIndex()
@@ -0,0 +1,55 @@
+"""
+Keyset pagination: cursor round trips and index-friendly predicates
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.models import Land
+from app.pagination import decode_cursor, encode_cursor, keyset_conditions
+
+
+def _sql(condition) -> str:
+    return str(condition.compile(dialect=asyncpg.dialect()))
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("null_tail", [False, True])
+def test_keyset_conditions_have_no_or(descending, null_tail):
+    last_value = None if null_tail else 10
+    conditions = keyset_conditions(Land.area, Land.id, last_value, 5, descending, null_tail)
+
+    for condition in conditions:
+        assert " OR " not in _sql(condition)
+
+
+def test_ascending_cursor_reads_non_null_keys_then_null_tail():
+    after, tail = keyset_conditions(Land.area, Land.id, 10, 5, False)
+    assert _sql(after).startswith("(lands.area, lands.id) > (")
+    assert _sql(tail) == "lands.area IS NULL"
+
+    (rest,) = keyset_conditions(Land.area, Land.id, None, 5, False, null_tail=True)
+    assert _sql(rest) == "lands.area IS NULL AND lands.id > $1::INTEGER"
+
+
+def test_descending_cursor_reads_null_block_then_non_null_keys():
+    rest, after = keyset_conditions(Land.area, Land.id, None, 5, True, null_tail=True)
+    assert _sql(rest) == "lands.area IS NULL AND lands.id < $1::INTEGER"
+    assert _sql(after) == "lands.area IS NOT NULL"
+
+    (after,) = keyset_conditions(Land.area, Land.id, 10, 5, True)
+    assert _sql(after).startswith("(lands.area, lands.id) < (")
+
+
+def test_cursor_round_trip_keeps_null_tail():
+    cursor = encode_cursor("area", False, None, 42, null_tail=True)
+    assert decode_cursor(cursor, "area", False) == (None, 42, True)
+
+    cursor = encode_cursor("area", True, "12.50", 7)
+    assert decode_cursor(cursor, "area", True) == ("12.50", 7, False)
+
+
+def test_cursor_for_another_sort_order_is_rejected():
+    cursor = encode_cursor("area", False, "1", 1)
+    with pytest.raises(HTTPException):
+        decode_cursor(cursor, "area", True)
@@ -0,0 +1,39 @@
+"""
+SQL compilation checks for /api/search/ queries (no database needed)
+"""
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.api.search import SEARCH_COLUMNS, SORT_KEYS, _flatgeobuf_page
+from app.formats import flatgeobuf_select
+from app.models import Land
+from app.pagination import keyset_conditions, keyset_order
+
+
+@pytest.mark.parametrize("sort_by", ["id", "area", "announced_value"])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("after_cursor", [False, True])
+def test_flatgeobuf_page_compiles_for_asyncpg(sort_by, descending, after_cursor):
+    sort_column, _ = SORT_KEYS[sort_by]
+    columns = list(SEARCH_COLUMNS)
+    if sort_column is not None:
+        columns.append(sort_column.label("_sort_key"))
+
+    phases = [[]]
+    if after_cursor:
+        last_value = None if sort_column is None else Decimal("10")
+        phases = [[c] for c in keyset_conditions(sort_column, Land.id, last_value, 5, descending)]
+
+    page, order_by, *extra = _flatgeobuf_page(
+        columns, [Land.city == "臺北市"], phases, keyset_order(sort_column, Land.id, descending),
+        sort_column is not None, descending, 0, 100
+    )
+    sql = str(flatgeobuf_select(page, order_by, *extra).compile(dialect=asyncpg.dialect()))
+
+    # Subscripted aggregates need parentheses: (array_agg(...))[n]
+    assert sql.count("(array_agg(") == len(extra) - 1
+    assert "array_agg(NULL" not in sql
+    assert "ST_AsFlatGeobuf(feature, " in sql
+    assert ("UNION ALL" in sql) == (len(phases) > 1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+API Concurrency Benchmark
+Fires a mixed bbox + stats workload at a running API and reports throughput
+
+Usage:
+    python benchmarks/concurrency.py --base-url http://localhost:8001 \
+        --concurrency 32 --duration 30 --stats-ratio 0.2
+
+With a blocking database layer one slow /api/stats request stalls every
+concurrent bbox request; with the async layer bbox latency should stay flat
+as the stats share grows.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+# Map viewports around Taipei at roughly zoom 14-15
+BBOX_CENTERS = [
+    (121.5170, 25.0478),
+    (121.5654, 25.0330),
+    (121.4628, 25.0120),
+    (121.5430, 25.0600),
+]
+BBOX_HALF_SIZE = 0.01
+
+STATS_PATHS = ['/api/stats/summary', '/api/stats/by-city', '/api/stats/by-district']
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    ordered = sorted(values)
+    index = max(0, int(round(pct / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+def pick_request(rng: random.Random, stats_ratio: float):
+    """Return (label, path, params) for the next request in the mix"""
+    if rng.random() < stats_ratio:
+        path = rng.choice(STATS_PATHS)
+        return 'stats', path, {}
+
+    lng, lat = rng.choice(BBOX_CENTERS)
+    lng += rng.uniform(-0.005, 0.005)
+    lat += rng.uniform(-0.005, 0.005)
+    return 'bbox', '/api/lands/bbox', {
+        'min_lng': lng - BBOX_HALF_SIZE,
+        'min_lat': lat - BBOX_HALF_SIZE,
+        'max_lng': lng + BBOX_HALF_SIZE,
+        'max_lat': lat + BBOX_HALF_SIZE,
+        'limit': 500,
+        'zoom': 15,
+    }
+
+
+async def worker(client, deadline, stats_ratio, seed, latencies, errors):
+    """Issue requests back to back until the deadline"""
+    rng = random.Random(seed)
+
+    while time.perf_counter() < deadline:
+        label, path, params = pick_request(rng, stats_ratio)
+        start = time.perf_counter()
+        try:
+            response = await client.get(path, params=params)
+            await response.aread()
+            if response.status_code >= 400:
+                errors[label] += 1
+                continue
+        except httpx.HTTPError:
+            errors[label] += 1
+            continue
+        latencies[label].append(time.perf_counter() - start)
+
+
+async def run(base_url, concurrency, duration, stats_ratio, seed):
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            worker(client, deadline, stats_ratio, seed + i, latencies, errors)
+            for i in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"Concurrency {concurrency}, stats ratio {stats_ratio:.0%}, {elapsed:.1f}s")
+    print(f"Throughput: {total / elapsed:.1f} req/s ({total} requests)")
+    print(f"{'workload':<8} {'count':>7} {'errors':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+
+    for label in ('bbox', 'stats'):
+        values = latencies.get(label)
+        if not values:
+            continue
+        print(
+            f"{label:<8} {len(values):>7} {errors[label]:>7} "
+            f"{statistics.mean(values) * 1000:>9.1f} "
+            f"{percentile(values, 50) * 1000:>9.1f} "
+            f"{percentile(values, 95) * 1000:>9.1f} "
+            f"{percentile(values, 99) * 1000:>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:8001')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run')
+    parser.add_argument('--stats-ratio', type=float, default=0.2, help='Share of stats requests (0-1)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.base_url, args.concurrency, args.duration, args.stats_ratio, args.seed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Importer Peak Memory Benchmark
+Compares peak RSS of whole-document parsing against the streaming iterparse
+pipeline on one large synthetic XML/KML pair
+
+Usage:
+    python benchmarks/importer_memory.py --parcels 200000 --vertices 40
+
+Each mode runs in a fresh subprocess so its ru_maxrss is not polluted by the
+other. Rows are consumed in write-sized batches and discarded, as the
+importer does when writing to the database.
+"""
+
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from lxml import etree
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from generate_synthetic_data import write_file_pair  # noqa: E402
+from import_land_data import KML_NAMESPACES, WRITE_BATCH_SIZE, LandDataImporter, _batched  # noqa: E402
+
+
+def consume_whole_document(importer: LandDataImporter, xml_path: Path, kml_path: Path) -> int:
+    """The pre-streaming pipeline: parse both documents fully, then build every row"""
+    tree = etree.parse(str(xml_path))
+    lands = [
+        {'parcel_no': importer._get_text(e, '地號'), 'area': importer._get_decimal(e, '登記面積')}
+        for e in tree.getroot().findall('.//土地標示部')
+    ]
+
+    geometries = {}
+    kml_root = etree.parse(str(kml_path)).getroot()
+    for placemark in kml_root.findall('.//kml:Placemark', KML_NAMESPACES):
+        parcel_no = placemark.find('.//kml:SimpleData[@name="PARCELNO"]', KML_NAMESPACES).text
+        coords = placemark.find('.//kml:coordinates', KML_NAMESPACES).text
+        geometries[parcel_no] = importer._kml_coords_to_ewkb(coords)
+
+    rows = [(land['parcel_no'], land['area'], geometries[land['parcel_no']]) for land in lands]
+    return sum(len(batch) for batch in _batched(rows, WRITE_BATCH_SIZE))
+
+
+def consume_streaming(importer: LandDataImporter, xml_path: Path, kml_path: Path) -> int:
+    rows = importer.iter_file_pair_rows(xml_path, kml_path)
+    return sum(len(batch) for batch in _batched(rows, WRITE_BATCH_SIZE))
+
+
+def run_mode(mode: str, directory: Path):
+    """Child process entry point: prints '<rows> <peak RSS MiB>'"""
+    importer = LandDataImporter(str(directory), db_url=None)
+    consume = consume_streaming if mode == 'streaming' else consume_whole_document
+    rows = consume(importer, directory / 'land.xml', directory / 'land.kml')
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mib = peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    print(f'{rows} {peak_mib:.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--parcels', type=int, default=200000)
+    parser.add_argument('--vertices', type=int, default=40, help='Vertices per polygon')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mode', choices=['whole', 'streaming'], help=argparse.SUPPRESS)
+    parser.add_argument('--dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, Path(args.dir))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_file_pair(
+            directory / 'land.xml', directory / 'land.kml', args.parcels, random.Random(args.seed),
+            '臺北市', '中正區', 121.519, 25.032,
+            min_vertices=args.vertices, max_vertices=args.vertices,
+            short_form_ratio=0, missing_geometry_ratio=0
+        )
+        xml_mib = (directory / 'land.xml').stat().st_size / 2 ** 20
+        kml_mib = (directory / 'land.kml').stat().st_size / 2 ** 20
+        print(f'{args.parcels} parcels: XML {xml_mib:.1f} MiB, KML {kml_mib:.1f} MiB')
+        print(f"{'mode':<10} {'rows':>9} {'peak RSS MiB':>13}")
+
+        for mode in ('whole', 'streaming'):
+            out = subprocess.run(
+                [sys.executable, __file__, '--mode', mode, '--dir', tmp],
+                check=True, capture_output=True, text=True
+            ).stdout.split()
+            print(f'{mode:<10} {out[0]:>9} {out[1]:>13}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+KML Coordinate Decoding Micro-benchmark
+Times the importer's NumPy EWKB decoder against the per-vertex WKT path it
+replaced, for polygons of increasing vertex count
+
+Usage:
+    python benchmarks/kml_decode.py --polygons 2000
+
+The "decode" columns time only the Python-side conversion. The WKT path is
+pure string shuffling and defers float parsing to the database, so the
+"+ read" columns add the cost of reading the result back into a geometry,
+using GEOS (shapely) as a stand-in for the PostGIS input functions.
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+import shapely
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from import_land_data import LandDataImporter  # noqa: E402
+
+VERTEX_COUNTS = (5, 20, 100, 500)
+
+
+def kml_coords_to_wkt(coords_text: str):
+    """The importer's former WKT conversion, kept here as the baseline"""
+    coords = coords_text.strip().split()
+    points = []
+
+    for coord in coords:
+        parts = coord.split(',')
+        if len(parts) >= 2:
+            lon, lat = parts[0], parts[1]
+            points.append(f"{lon} {lat}")
+
+    if len(points) >= 3:
+        if points[0] != points[-1]:
+            points.append(points[0])
+        return f"POLYGON(({', '.join(points)}))"
+
+    return None
+
+
+def make_coordinates(rng: random.Random, vertices: int) -> str:
+    lng, lat = rng.uniform(120.0, 122.0), rng.uniform(22.0, 25.3)
+    return ' '.join(
+        f'{lng + 0.0005 * rng.random():.7f},{lat + 0.0005 * rng.random():.7f},0'
+        for _ in range(vertices)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--polygons', type=int, default=2000, help='Polygons per vertex count')
+    parser.add_argument('--repeat', type=int, default=5, help='Best of N runs')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    importer = LandDataImporter('.', db_url=None)
+    decoders = {
+        'wkt': (kml_coords_to_wkt, shapely.from_wkt),
+        'ewkb': (importer._kml_coords_to_ewkb, shapely.from_wkb),
+    }
+
+    def best_per_polygon(fn, items):
+        best = min(timeit.repeat(lambda: [fn(item) for item in items], number=1, repeat=args.repeat))
+        return best / len(items) * 1e6
+
+    print('Microseconds per polygon')
+    print(f"{'vertices':>8} {'wkt decode':>11} {'+ read':>8} {'ewkb decode':>12} {'+ read':>8} {'speedup':>8}")
+
+    for vertices in VERTEX_COUNTS:
+        samples = [make_coordinates(rng, vertices) for _ in range(args.polygons)]
+        timings = {}
+
+        for name, (decode, read) in decoders.items():
+            encoded = [decode(text) for text in samples]
+            decode_us = best_per_polygon(decode, samples)
+            timings[name] = (decode_us, decode_us + best_per_polygon(read, encoded))
+
+        (wkt_decode, wkt_total), (ewkb_decode, ewkb_total) = timings['wkt'], timings['ewkb']
+        print(
+            f"{vertices:>8} {wkt_decode:>11.1f} {wkt_total:>8.1f} {ewkb_decode:>12.1f} "
+            f"{ewkb_total:>8.1f} {wkt_total / ewkb_total:>7.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Response Payload Benchmark
+Bytes on the wire and server CPU per response for /api/lands/bbox at
+limit=3000, uncompressed (before) and with gzip / brotli (after), plus the
+JSON serialization cost of a large /api/search/ page
+
+Usage:
+    # In-process: synthetic FeatureCollection through CompressionMiddleware
+    python benchmarks/response_payload.py
+
+    # Against a running API; CPU is read from the server's /proc entry
+    python benchmarks/response_payload.py --base-url http://localhost:8001 --server-pid 12345
+
+In-process mode builds bbox bodies shaped like PostgreSQL's json_build_object
+output (features at full precision, 5-40 vertices) and times the
+middleware alone with process CPU time. Live mode sends the same viewport
+with each Accept-Encoding and reports downloaded bytes and, with
+--server-pid (Linux), server CPU per request, which includes the query.
+
+The search section compares the former jsonable_encoder + json.dumps path
+with the Pydantic JSON serializer FastAPI uses for response_model routes.
+"""
+
+import argparse
+import asyncio
+import datetime
+import decimal
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import types
+from pathlib import Path
+from typing import List
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+sys.path.insert(0, str(ROOT / 'backend'))
+
+from generate_synthetic_data import polygon_coordinates  # noqa: E402
+from app.compression import SUPPORTED_ENCODINGS, CompressionMiddleware  # noqa: E402
+
+ENCODINGS = ('identity', *SUPPORTED_ENCODINGS)
+
+# Taipei, Da'an district: dense parcels at zoom 17
+CENTER = (121.543, 25.026)
+BBOX = {'min_lng': 121.535, 'min_lat': 25.020, 'max_lng': 121.551, 'max_lat': 25.032, 'zoom': 17, 'limit': 3000}
+
+
+def synthetic_features(rng: random.Random, count: int) -> List[str]:
+    """Features serialized the way PostgreSQL's json_build_object writes them"""
+    features = []
+    for i in range(count):
+        ring = [
+            [round(float(x), 7), round(float(y), 7)]
+            for x, y, _ in (point.split(',') for point in polygon_coordinates(
+                rng, CENTER[0] + rng.gauss(0, 0.005), CENTER[1] + rng.gauss(0, 0.005), rng.randint(5, 40)
+            ).split())
+        ]
+        geometry = json.dumps({'type': 'Polygon', 'coordinates': [ring]}, separators=(',', ':'))
+        properties = (
+            f'{{"id" : {100000 + i}, "city" : "臺北市", "district" : "大安區", '
+            f'"section_name" : "仁愛段二小段", "parcel_no" : "{i // 4 + 1:04d}{i % 4:04d}", '
+            f'"area" : {rng.lognormvariate(5.5, 1.2):.2f}, "announced_value" : {rng.randint(3000, 900000)}, '
+            f'"announced_land_price" : {rng.randint(600, 180000)}, "owner_name" : "中華民國"}}'
+        )
+        features.append(f'{{"type" : "Feature", "geometry" : {geometry}, "properties" : {properties}}}')
+    return features
+
+
+def feature_collection_app(features: List[str], chunk_size: int = 500):
+    """ASGI app streaming the FeatureCollection in chunks, like the bbox endpoint"""
+
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': b'{"type":"FeatureCollection","features":[',
+                    'more_body': True})
+        for start in range(0, len(features), chunk_size):
+            chunk = ','.join(features[start:start + chunk_size])
+            await send({'type': 'http.response.body',
+                        'body': (chunk if start == 0 else ',' + chunk).encode(), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b']}'})
+
+    return app
+
+
+async def run_once(app, encoding: str) -> int:
+    """Send one request through the middleware; returns body bytes produced"""
+    headers = [] if encoding == 'identity' else [(b'accept-encoding', encoding.encode())]
+    scope = {'type': 'http', 'method': 'GET', 'path': '/api/lands/bbox', 'headers': headers}
+    size = 0
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def send(message):
+        nonlocal size
+        if message['type'] == 'http.response.body':
+            size += len(message.get('body', b''))
+
+    await app(scope, receive, send)
+    return size
+
+
+def bench_in_process(features: int, repeat: int, seed: int):
+    app = CompressionMiddleware(feature_collection_app(synthetic_features(random.Random(seed), features)))
+    print(f"/api/lands/bbox, {features} synthetic features, in-process ({repeat} runs)")
+    print(f"{'encoding':<10} {'bytes':>11} {'ratio':>7} {'cpu ms':>8}")
+
+    baseline = None
+    for encoding in ENCODINGS:
+        size = asyncio.run(run_once(app, encoding))
+        cpu = []
+        for _ in range(repeat):
+            started = time.process_time()
+            asyncio.run(run_once(app, encoding))
+            cpu.append(time.process_time() - started)
+        baseline = baseline or size
+        print(f"{encoding:<10} {size:>11,} {size / baseline:>6.1%} {statistics.median(cpu) * 1000:>8.1f}")
+
+
+def process_cpu_seconds(pid: int) -> float:
+    """utime + stime of a process from /proc (Linux)"""
+    fields = Path(f'/proc/{pid}/stat').read_text().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def bench_live(base_url: str, server_pid: int, repeat: int):
+    print(f"{base_url}/api/lands/bbox limit=3000 zoom=17 ({repeat} requests per encoding)")
+    print(f"{'encoding':<10} {'wire bytes':>11} {'ratio':>7} {'p50 ms':>8} {'server cpu ms':>14}")
+
+    baseline = None
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        for encoding in ENCODINGS:
+            headers = {'Accept-Encoding': encoding}
+            client.get('/api/lands/bbox', params=BBOX, headers=headers)  # warm up
+
+            cpu_before = process_cpu_seconds(server_pid) if server_pid else None
+            latencies, wire = [], 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = client.get('/api/lands/bbox', params=BBOX, headers=headers)
+                response.read()
+                latencies.append(time.perf_counter() - started)
+                wire = response.num_bytes_downloaded
+            cpu = (
+                f"{(process_cpu_seconds(server_pid) - cpu_before) / repeat * 1000:>14.1f}"
+                if server_pid else f"{'-':>14}"
+            )
+
+            baseline = baseline or wire
+            print(f"{encoding:<10} {wire:>11,} {wire / baseline:>6.1%} "
+                  f"{statistics.median(latencies) * 1000:>8.1f} {cpu}")
+
+
+def bench_search_serialization(rows: int, repeat: int):
+    """Former jsonable_encoder + json.dumps path vs Pydantic's JSON serializer"""
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    from app.schemas import LandResponse
+
+    lands = [
+        types.SimpleNamespace(
+            id=i, created_at=datetime.datetime(2025, 1, 1), section_code='0170', section_name='仁愛段二小段',
+            parcel_no=f'{i // 4 + 1:04d}{i % 4:04d}', city='臺北市', district='大安區',
+            area=decimal.Decimal('123.45'), land_use_zone='住宅區', land_use_type=None, announced_value=100000,
+            announced_land_price=20000, owner_name='中華民國', owner_id=None, owner_type='國有',
+            right_range_type='全部', right_denominator=1, right_numerator=1, declared_land_price=20000,
+            manager_name='財政部國有財產署'
+        )
+        for i in range(rows)
+    ]
+    adapter = TypeAdapter(List[LandResponse])
+
+    def before():
+        data = jsonable_encoder(adapter.dump_python(adapter.validate_python(lands), mode='json'))
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+
+    def after():
+        return adapter.dump_json(adapter.validate_python(lands))
+
+    print(f"\n/api/search/ serialization, {rows} rows ({repeat} runs)")
+    print(f"{'path':<28} {'bytes':>11} {'cpu ms':>8}")
+    for label, fn in (('jsonable_encoder + json', before), ('pydantic dump_json', after)):
+        size = len(fn())
+        cpu = []
+        for _ in range(repeat):
+            started = time.process_time()
+            fn()
+            cpu.append(time.process_time() - started)
+        print(f"{label:<28} {size:>11,} {statistics.median(cpu) * 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', help='Measure a running API instead of in-process')
+    parser.add_argument('--server-pid', type=int, help='API process id for server CPU (live mode, Linux)')
+    parser.add_argument('--features', type=int, default=3000)
+    parser.add_argument('--search-rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.base_url:
+        bench_live(args.base_url, args.server_pid, args.repeat)
+    else:
+        bench_in_process(args.features, args.repeat, args.seed)
+
+    bench_search_serialization(args.search_rows, max(3, args.repeat // 4))
+
+
+if __name__ == '__main__':
+    main()
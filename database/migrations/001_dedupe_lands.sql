@@ -0,0 +1,36 @@
+-- One-off cleanup for databases loaded by the append-only importer, which
+-- added a new copy of every parcel on each run. Run once, before applying
+-- database/schema.sql, so its unique (city, section_code, parcel_no) index
+-- can be built:
+--
+--   psql "你的資料庫連接字串" -f database/migrations/001_dedupe_lands.sql
+--
+-- Keeps the most recently loaded copy (highest id) of each parcel. Rows with
+-- a NULL city, section_code or parcel_no are left alone: the unique index
+-- does not treat them as duplicates. The number of rows to delete is printed
+-- first; replace COMMIT with ROLLBACK for a dry run.
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+SELECT count(*) AS duplicate_rows
+FROM lands l
+WHERE EXISTS (
+    SELECT 1 FROM lands newer
+    WHERE newer.city = l.city
+      AND newer.section_code = l.section_code
+      AND newer.parcel_no = l.parcel_no
+      AND newer.id > l.id
+);
+
+DELETE FROM lands l
+USING lands newer
+WHERE newer.city = l.city
+  AND newer.section_code = l.section_code
+  AND newer.parcel_no = l.parcel_no
+  AND newer.id > l.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_lands_city_section_parcel_key ON lands(city, section_code, parcel_no);
+
+COMMIT;
@@ -1,6 +1,9 @@
 -- Enable PostGIS extension
 CREATE EXTENSION IF NOT EXISTS postgis;
 
+-- Enable trigram matching (partial-match and similarity search)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create lands table
 CREATE TABLE IF NOT EXISTS lands (
     id SERIAL PRIMARY KEY,
@@ -23,23 +26,136 @@ CREATE TABLE IF NOT EXISTS lands (
     declared_land_price INTEGER,        -- 申報地價
     manager_name VARCHAR(200),          -- 管理者名稱
     geometry GEOMETRY(Polygon, 4326),   -- 地理邊界（PostGIS）
+    geometry_low GEOMETRY(Polygon, 4326),    -- 簡化邊界（zoom <= 12）
+    geometry_medium GEOMETRY(Polygon, 4326), -- 簡化邊界（zoom 13-14）
+    source_file VARCHAR(255),           -- 來源檔案（相對於資料目錄的 XML 路徑）
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+-- Columns added after the initial release (for existing databases)
+ALTER TABLE lands ADD COLUMN IF NOT EXISTS geometry_low GEOMETRY(Polygon, 4326);
+ALTER TABLE lands ADD COLUMN IF NOT EXISTS geometry_medium GEOMETRY(Polygon, 4326);
+ALTER TABLE lands ADD COLUMN IF NOT EXISTS source_file VARCHAR(255);
+
 -- Create spatial index (CRITICAL for performance!)
 CREATE INDEX IF NOT EXISTS idx_lands_geometry ON lands USING GIST(geometry);
 
 -- Create frequently used query indexes
-CREATE INDEX IF NOT EXISTS idx_lands_city_district ON lands(city, district);
-CREATE INDEX IF NOT EXISTS idx_lands_section_parcel ON lands(section_code, parcel_no);
+-- (city, district, id) also serves id-ordered keyset pages filtered by city/district
+CREATE INDEX IF NOT EXISTS idx_lands_city_district_id ON lands(city, district, id);
+-- (city, section_code, parcel_no) is the parcel's natural key (section codes
+-- repeat across cities); the importer upserts on it. Databases loaded by the
+-- old append-only importer need database/migrations/001_dedupe_lands.sql first
+CREATE UNIQUE INDEX IF NOT EXISTS idx_lands_city_section_parcel_key ON lands(city, section_code, parcel_no);
+CREATE INDEX IF NOT EXISTS idx_lands_source_file ON lands(source_file);
 CREATE INDEX IF NOT EXISTS idx_lands_owner ON lands(owner_name);
 CREATE INDEX IF NOT EXISTS idx_lands_section_code ON lands(section_code);
 
--- Create index for area-based queries
-CREATE INDEX IF NOT EXISTS idx_lands_area ON lands(area);
+-- Create trigram indexes for partial-match (ILIKE '%...%') and similarity search
+CREATE INDEX IF NOT EXISTS idx_lands_owner_trgm ON lands USING GIN(owner_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_lands_section_name_trgm ON lands USING GIN(section_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_lands_parcel_no_trgm ON lands USING GIN(parcel_no gin_trgm_ops);
+
+-- Create index for area-based queries (and keyset pages sorted by area)
+CREATE INDEX IF NOT EXISTS idx_lands_area_id ON lands(area, id);
+
+-- Create index for value-based queries (and keyset pages sorted by value)
+CREATE INDEX IF NOT EXISTS idx_lands_announced_value_id ON lands(announced_value, id);
+
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS idx_lands_city_district;
+DROP INDEX IF EXISTS idx_lands_area;
+DROP INDEX IF EXISTS idx_lands_announced_value;
+DROP INDEX IF EXISTS idx_lands_section_parcel;
+DROP INDEX IF EXISTS idx_lands_section_parcel_key;
+
+-- Imported source files, used to skip unchanged files on incremental runs
+CREATE TABLE IF NOT EXISTS import_manifest (
+    file_path VARCHAR(255) PRIMARY KEY, -- 來源檔案（相對於資料目錄的 XML 路徑）
+    checksum CHAR(64) NOT NULL,         -- XML + KML 內容的 SHA-256
+    row_count INTEGER NOT NULL,         -- 匯入筆數
+    imported_at TIMESTAMP DEFAULT NOW() -- 匯入時間
+);
+
+-- Precomputed grid clusters for low zoom levels (filled by the importer)
+CREATE TABLE IF NOT EXISTS land_clusters (
+    zoom SMALLINT NOT NULL,             -- 地圖縮放層級
+    cell_x INTEGER NOT NULL,            -- 網格欄
+    cell_y INTEGER NOT NULL,            -- 網格列
+    parcel_count INTEGER NOT NULL,      -- 土地筆數
+    total_area DECIMAL(18, 2),          -- 總面積（平方公尺）
+    centroid GEOMETRY(Point, 4326),     -- 網格內土地中心點
+    PRIMARY KEY (zoom, cell_x, cell_y)
+);
+
+CREATE INDEX IF NOT EXISTS idx_land_clusters_centroid ON land_clusters USING GIST(centroid);
+
+-- Administrative gazetteer: one row per city, district and section with
+-- parcel counts and bounding boxes (rebuilt by the importer)
+CREATE TABLE IF NOT EXISTS gazetteer (
+    id SERIAL PRIMARY KEY,
+    level VARCHAR(10) NOT NULL,         -- city / district / section
+    city VARCHAR(50) NOT NULL,          -- 縣市
+    district VARCHAR(50),               -- 鄉鎮市區（city 層級為 NULL）
+    section_code VARCHAR(10),           -- 段代碼（section 層級才有）
+    section_name VARCHAR(100),          -- 段小段名稱
+    parcel_count INTEGER NOT NULL,      -- 土地筆數
+    min_lng DOUBLE PRECISION,
+    min_lat DOUBLE PRECISION,
+    max_lng DOUBLE PRECISION,
+    max_lat DOUBLE PRECISION
+);
+
+CREATE INDEX IF NOT EXISTS idx_gazetteer_city_district ON gazetteer(city, district);
+
+-- Statistics rollups (refreshed by the importer, read by /api/stats/*)
+-- Each has a unique index so it can be refreshed CONCURRENTLY
+CREATE MATERIALIZED VIEW IF NOT EXISTS stats_summary AS
+SELECT
+    1 AS id,
+    COUNT(id) AS total_lands,
+    SUM(area) AS total_area,
+    COUNT(DISTINCT city) AS cities_count,
+    COUNT(DISTINCT district) AS districts_count,
+    AVG(announced_value) FILTER (WHERE announced_value > 0) AS avg_announced_value
+FROM lands;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_stats_summary_id ON stats_summary(id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS stats_by_city AS
+SELECT
+    city,
+    COUNT(id) AS land_count,
+    SUM(area) AS total_area,
+    AVG(area) AS avg_area,
+    AVG(announced_value) AS avg_announced_value
+FROM lands
+WHERE city IS NOT NULL
+GROUP BY city;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_stats_by_city_city ON stats_by_city(city);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS stats_by_district AS
+SELECT
+    city,
+    district,
+    COUNT(id) AS land_count,
+    SUM(area) AS total_area,
+    AVG(area) AS avg_area
+FROM lands
+WHERE district IS NOT NULL
+GROUP BY city, district;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_stats_by_district_city_district ON stats_by_district(city, district);
+
+-- Dataset version stamp (written by the importer, used to key API caches)
+CREATE TABLE IF NOT EXISTS dataset_version (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version VARCHAR(64) NOT NULL,       -- 資料版本
+    updated_at TIMESTAMP DEFAULT NOW()  -- 更新時間
+);
 
--- Create index for value-based queries
-CREATE INDEX IF NOT EXISTS idx_lands_announced_value ON lands(announced_value);
+INSERT INTO dataset_version (id, version) VALUES (1, '0') ON CONFLICT (id) DO NOTHING;
 
 -- Add comments for documentation
 COMMENT ON TABLE lands IS '台灣國有土地資料表';
@@ -50,3 +166,13 @@ COMMENT ON COLUMN lands.city IS '縣市';
 COMMENT ON COLUMN lands.district IS '鄉鎮市區';
 COMMENT ON COLUMN lands.area IS '登記面積（平方公尺）';
 COMMENT ON COLUMN lands.geometry IS '地理邊界（WGS84座標系統）';
+COMMENT ON COLUMN lands.geometry_low IS '簡化邊界（zoom <= 12，由匯入程式產生）';
+COMMENT ON COLUMN lands.geometry_medium IS '簡化邊界（zoom 13-14，由匯入程式產生）';
+COMMENT ON COLUMN lands.source_file IS '來源檔案';
+COMMENT ON TABLE land_clusters IS '低縮放層級的土地網格聚合';
+COMMENT ON MATERIALIZED VIEW stats_summary IS '總體統計（匯入後更新）';
+COMMENT ON MATERIALIZED VIEW stats_by_city IS '縣市統計（匯入後更新）';
+COMMENT ON MATERIALIZED VIEW stats_by_district IS '鄉鎮市區統計（匯入後更新）';
+COMMENT ON TABLE gazetteer IS '行政區與地段索引（含筆數與範圍）';
+COMMENT ON TABLE dataset_version IS '資料版本（每次匯入後更新）';
+COMMENT ON TABLE import_manifest IS '已匯入的來源檔案與校驗碼';
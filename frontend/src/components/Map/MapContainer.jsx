@@ -35,7 +35,7 @@ function MapBoundsHandler({ onBoundsChange, onZoomChange }) {
         const currentZoom = map.getZoom();
         if (currentZoom >= MIN_ZOOM_FOR_DATA) {
           const bounds = map.getBounds();
-          onBoundsChange(bounds);
+          onBoundsChange(bounds, currentZoom);
         }
       }, 500);
     },
@@ -54,7 +54,7 @@ function MapBoundsHandler({ onBoundsChange, onZoomChange }) {
       // Zoom ends, check zoom level before loading
       if (currentZoom >= MIN_ZOOM_FOR_DATA) {
         const bounds = map.getBounds();
-        onBoundsChange(bounds);
+        onBoundsChange(bounds, currentZoom);
       }
     }
   });
@@ -136,7 +136,7 @@ export default function MapContainer({ onLandClick, mapCenter, searchFilters })
   /**
    * Handle map bounds change - fetch lands in view
    */
-  const handleBoundsChange = useCallback(async (bounds) => {
+  const handleBoundsChange = useCallback(async (bounds, mapZoom) => {
     // Skip if a request is already in progress
     if (requestInProgressRef.current) {
       return;
@@ -156,7 +156,8 @@ export default function MapContainer({ onLandClick, mapCenter, searchFilters })
         _southWest.lat,
         _northEast.lng,
         _northEast.lat,
-        bboxLimit
+        bboxLimit,
+        mapZoom
       );
 
       // Apply search filters if they exist
@@ -30,9 +30,19 @@ apiClient.interceptors.response.use(
  */
 export const landAPI = {
   // Get lands within bounding box (for map)
-  getByBbox: async (minLng, minLat, maxLng, maxLat, limit = 500) => {
-    const response = await apiClient.get('/lands/bbox', {
-      params: { min_lng: minLng, min_lat: minLat, max_lng: maxLng, max_lat: maxLat, limit }
+  // zoom selects the server-side geometry simplification level
+  getByBbox: async (minLng, minLat, maxLng, maxLat, limit = 500, zoom = null) => {
+    const params = { min_lng: minLng, min_lat: minLat, max_lng: maxLng, max_lat: maxLat, limit };
+    if (zoom !== null) params.zoom = Math.round(zoom);
+
+    const response = await apiClient.get('/lands/bbox', { params });
+    return response.data;
+  },
+
+  // Get aggregated parcel clusters within bounding box (for low zoom levels)
+  getClusters: async (minLng, minLat, maxLng, maxLat, zoom) => {
+    const response = await apiClient.get('/lands/clusters', {
+      params: { min_lng: minLng, min_lat: minLat, max_lng: maxLng, max_lat: maxLat, zoom: Math.round(zoom) }
     });
     return response.data;
   },
@@ -43,12 +53,49 @@ export const landAPI = {
     return response.data;
   },
 
+  // Get the lands containing a point (smallest first)
+  getAt: async (lng, lat) => {
+    const response = await apiClient.get('/lands/at', {
+      params: { lng, lat }
+    });
+    return response.data;
+  },
+
+  // Get the k nearest lands with their distance in meters
+  getNearest: async (lng, lat, k = 5, maxDistance = null) => {
+    const params = { lng, lat, k };
+    if (maxDistance !== null) {
+      params.max_distance = maxDistance;
+    }
+    const response = await apiClient.get('/lands/nearest', { params });
+    return response.data;
+  },
+
+  // Get several lands in one request; ids that do not exist come back in `missing`
+  getBatch: async (ids, { fields = null, includeGeometry = false } = {}) => {
+    const response = await apiClient.post('/lands/batch', {
+      ids,
+      fields,
+      include_geometry: includeGeometry
+    });
+    return response.data;
+  },
+
   // List lands with pagination
   list: async (limit = 20, offset = 0) => {
     const response = await apiClient.get('/lands/', {
       params: { limit, offset }
     });
     return response.data;
+  },
+
+  // List lands with cursor pagination; returns { lands, nextCursor }
+  listPage: async (limit = 20, cursor = null) => {
+    const params = { limit };
+    if (cursor) params.cursor = cursor;
+
+    const response = await apiClient.get('/lands/', { params });
+    return { lands: response.data, nextCursor: response.headers['x-next-cursor'] || null };
   }
 };
 
@@ -62,6 +109,30 @@ export const searchAPI = {
     return response.data;
   },
 
+  // Search lands with cursor pagination; returns { lands, nextCursor }
+  searchPage: async (params, cursor = null) => {
+    const response = await apiClient.get('/search/', {
+      params: cursor ? { ...params, cursor } : params
+    });
+    return { lands: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+  },
+
+  // Autocomplete section names and parcel numbers
+  suggest: async (q, { city = null, district = null, kind = 'all', limit = 10 } = {}) => {
+    const params = { q, kind, limit };
+    if (city) params.city = city;
+    if (district) params.district = district;
+
+    const response = await apiClient.get('/search/suggest', { params });
+    return response.data;
+  },
+
+  // Get the full city → district → section tree with counts and bounding boxes
+  getGazetteer: async () => {
+    const response = await apiClient.get('/search/gazetteer');
+    return response.data;
+  },
+
   // Get all cities
   getCities: async () => {
     const response = await apiClient.get('/search/cities');
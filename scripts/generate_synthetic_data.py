@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Synthetic Land Data Generator
+Writes XML (attributes) / KML (geometry) file pairs in the structure read by
+import_land_data.py, for benchmarking without the government ALL/ dump
+
+Usage:
+    python scripts/generate_synthetic_data.py --output-dir ./synthetic \
+        --files 40 --parcels-per-file 10000
+
+Each file pair covers one district. Parcel numbers follow the XML
+"00170001" form; a share of KML placemarks carry the importer's normalized
+form instead, so its fallback matching path is exercised, and a share of
+parcels have no polygon at all. As in the real cadastre, section codes are
+numbered per city and repeat across cities; (city, section_code, parcel_no)
+is unique across the generated dataset.
+"""
+
+import argparse
+import logging
+import math
+import random
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from import_land_data import LandDataImporter
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Districts with an approximate centre (lng, lat) per city
+DISTRICTS = {
+    '臺北市': [('中正區', 121.519, 25.032), ('大安區', 121.543, 25.026), ('信義區', 121.571, 25.033),
+             ('士林區', 121.525, 25.093), ('北投區', 121.501, 25.132)],
+    '新北市': [('板橋區', 121.459, 25.011), ('新店區', 121.541, 24.967), ('淡水區', 121.441, 25.169),
+             ('三峽區', 121.369, 24.934)],
+    '桃園市': [('桃園區', 121.301, 24.993), ('中壢區', 121.225, 24.965), ('大溪區', 121.287, 24.880)],
+    '臺中市': [('西屯區', 120.640, 24.181), ('北屯區', 120.686, 24.182), ('豐原區', 120.718, 24.252)],
+    '臺南市': [('東區', 120.224, 22.980), ('安南區', 120.185, 23.047), ('新營區', 120.316, 23.310)],
+    '高雄市': [('苓雅區', 120.312, 22.624), ('鳳山區', 120.357, 22.627), ('旗山區', 120.483, 22.888)],
+    '花蓮縣': [('花蓮市', 121.607, 23.982), ('吉安鄉', 121.568, 23.961), ('秀林鄉', 121.620, 24.117)],
+}
+
+SECTION_NAMES = ['和平', '仁愛', '中山', '信義', '光復', '復興', '民生', '成功', '興隆', '福德', '龍山', '新生']
+SUB_SECTIONS = ['', '一小段', '二小段', '三小段', '四小段']
+
+LAND_USE_ZONES = ['住宅區', '商業區', '工業區', '農業區', '保護區', '公園用地', '道路用地', '一般農業區', '山坡地保育區']
+LAND_USE_TYPES = ['甲種建築用地', '乙種建築用地', '丙種建築用地', '交通用地', '農牧用地', '林業用地', '水利用地', None]
+
+MANAGERS = ['財政部國有財產署', '交通部公路局', '經濟部水利署', '農業部林業及自然保育署', '國防部軍備局']
+
+KML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<kml xmlns="http://www.opengis.net/kml/2.2"><Document>\n'
+)
+
+# Polygon radius in degrees (~15-70 m)
+MIN_RADIUS = 0.00015
+MAX_RADIUS = 0.0007
+
+# Parcels per section, and sub-parcels (0001-0003) per main parcel number
+PARCELS_PER_SECTION = 2000
+SUB_PARCELS = 4
+
+# Only the parcel number normalization is used; no database connection
+_normalizer = LandDataImporter('.', db_url=None)
+
+
+def polygon_coordinates(rng: random.Random, lng: float, lat: float, vertices: int) -> str:
+    """A simple (star-shaped) polygon around a point, as KML "lon,lat,0" tuples"""
+    radius = rng.uniform(MIN_RADIUS, MAX_RADIUS)
+    angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(vertices))
+    points = [
+        (lng + radius * r * math.cos(a), lat + radius * r * math.sin(a))
+        for a, r in ((a, rng.uniform(0.6, 1.0)) for a in angles)
+    ]
+    points.append(points[0])
+    return ' '.join(f'{x:.7f},{y:.7f},0' for x, y in points)
+
+
+def land_element(rng: random.Random, city: str, district: str, section_code: str,
+                 section_name: str, parcel_no: str) -> str:
+    """One 土地標示部 record with its 所有權人 owner block"""
+    zone = rng.choice(LAND_USE_ZONES)
+    use_type = rng.choice(LAND_USE_TYPES)
+    value = rng.randint(3000, 900000) if rng.random() > 0.05 else 0
+
+    fields = [
+        ('縣市', city),
+        ('鄉鎮市區', district),
+        ('段代碼', section_code),
+        ('段小段', section_name),
+        ('地號', parcel_no),
+        ('登記面積', f'{rng.lognormvariate(5.5, 1.2):.2f}'),
+        ('使用分區', zone),
+        ('使用地類別', use_type),
+        ('公告現值', value),
+        ('公告地價', value // 5),
+    ]
+    owner = [
+        ('所有權人名稱', '中華民國'),
+        ('所有權人類別', '國有'),
+        ('權利範圍類別', '全部'),
+        ('權利範圍持分分母', 1),
+        ('權利範圍持分分子', 1),
+        ('申報地價', value // 5),
+        ('管理者名稱', rng.choice(MANAGERS)),
+    ]
+
+    def render(pairs):
+        return ''.join(f'<{tag}>{text}</{tag}>' for tag, text in pairs if text is not None)
+
+    return f'<土地標示部>{render(fields)}<所有權人>{render(owner)}</所有權人></土地標示部>\n'
+
+
+def write_file_pair(xml_path: Path, kml_path: Path, parcels: int, rng: random.Random,
+                    city: str, district: str, lng: float, lat: float, first_section: int = 0,
+                    min_vertices: int = 5, max_vertices: int = 40,
+                    short_form_ratio: float = 0.3, missing_geometry_ratio: float = 0.01) -> int:
+    """
+    Write one district's XML/KML pair with the given number of parcels
+
+    Section codes are numbered from first_section. Returns the number of
+    sections used.
+    """
+    sections = max(1, parcels // PARCELS_PER_SECTION)
+
+    with open(xml_path, 'w', encoding='utf-8') as xml, open(kml_path, 'w', encoding='utf-8') as kml:
+        xml.write('<?xml version="1.0" encoding="UTF-8"?>\n<國有土地清冊>\n')
+        kml.write(KML_HEADER)
+
+        for i in range(parcels):
+            section = i % sections
+            section_code = f'{1000 + (first_section + section) % 9000:04d}'
+            section_name = (SECTION_NAMES[section % len(SECTION_NAMES)] + '段'
+                            + SUB_SECTIONS[(section // len(SECTION_NAMES)) % len(SUB_SECTIONS)])
+            number = i // sections
+            parcel_no = f'{number // SUB_PARCELS + 1:04d}{number % SUB_PARCELS:04d}'
+
+            xml.write(land_element(rng, city, district, section_code, section_name, parcel_no))
+
+            if rng.random() < missing_geometry_ratio:
+                continue
+
+            if rng.random() < short_form_ratio:
+                kml_parcel = _normalizer._normalize_parcel_no(parcel_no)
+            else:
+                kml_parcel = parcel_no
+            coordinates = polygon_coordinates(
+                rng,
+                lng + rng.gauss(0, 0.02),
+                lat + rng.gauss(0, 0.02),
+                rng.randint(min_vertices, max_vertices)
+            )
+            kml.write(
+                f'<Placemark><name>{parcel_no}</name><ExtendedData><SchemaData schemaUrl="#parcel">'
+                f'<SimpleData name="SECTION">{section_code}</SimpleData>'
+                f'<SimpleData name="PARCELNO">{kml_parcel}</SimpleData>'
+                f'</SchemaData></ExtendedData><Polygon><outerBoundaryIs><LinearRing>'
+                f'<coordinates>{coordinates}</coordinates>'
+                f'</LinearRing></outerBoundaryIs></Polygon></Placemark>\n'
+            )
+
+        xml.write('</國有土地清冊>\n')
+        kml.write('</Document></kml>\n')
+
+    return sections
+
+
+def generate(output_dir: Path, files: int, parcels_per_file: int, seed: int = 42, **options):
+    """Write files XML/KML pairs into output_dir, cycling through the district list"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    districts = [(city, *district) for city, items in DISTRICTS.items() for district in items]
+    rng = random.Random(seed)
+    first_section = defaultdict(int)  # Next section number per city
+
+    for n in range(files):
+        city, district, lng, lat = districts[n % len(districts)]
+        stem = output_dir / f'synthetic_{n:04d}'
+        first_section[city] += write_file_pair(
+            stem.with_suffix('.xml'), stem.with_suffix('.kml'), parcels_per_file, rng,
+            city, district, lng, lat, first_section[city], **options
+        )
+
+    logger.info(f"Wrote {files} file pairs ({files * parcels_per_file} parcels) to {output_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output-dir', default='./synthetic')
+    parser.add_argument('--files', type=int, default=40)
+    parser.add_argument('--parcels-per-file', type=int, default=10000)
+    parser.add_argument('--min-vertices', type=int, default=5)
+    parser.add_argument('--max-vertices', type=int, default=40)
+    parser.add_argument('--short-form-ratio', type=float, default=0.3,
+                        help="Share of KML parcel numbers written as \"17-1\" instead of \"00170001\"")
+    parser.add_argument('--missing-geometry-ratio', type=float, default=0.01,
+                        help="Share of parcels without a KML polygon")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.min_vertices < 3 or args.max_vertices < args.min_vertices:
+        logger.error("Need 3 <= --min-vertices <= --max-vertices")
+        sys.exit(1)
+
+    generate(
+        Path(args.output_dir), args.files, args.parcels_per_file, args.seed,
+        min_vertices=args.min_vertices,
+        max_vertices=args.max_vertices,
+        short_form_ratio=args.short_form_ratio,
+        missing_geometry_ratio=args.missing_geometry_ratio
+    )
+
+
+if __name__ == '__main__':
+    main()
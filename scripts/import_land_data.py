@@ -5,13 +5,24 @@ Parses XML (attributes) and KML (geometry) files and imports into PostgreSQL
 """
 
 import os
+import io
 import sys
+import hashlib
+import struct
+import argparse
 import logging
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from time import perf_counter
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
 from lxml import etree
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_values
 from tqdm import tqdm
 from dotenv import load_dotenv
 
@@ -22,20 +33,191 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Simplified geometry columns and their tolerances in degrees (~10 m and ~2 m),
+# served by /api/lands/bbox at low zoom levels
+SIMPLIFY_LEVELS = {
+    'geometry_low': 0.0001,
+    'geometry_medium': 0.00002,
+}
+
+# Materialized views refreshed after each import (see database/schema.sql)
+STATS_ROLLUP_VIEWS = ('stats_summary', 'stats_by_city', 'stats_by_district')
+
+# Zoom levels served by /api/lands/clusters; each level gets a grid of
+# CLUSTER_CELLS_PER_TILE x CLUSTER_CELLS_PER_TILE cells per web map tile
+CLUSTER_ZOOMS = range(5, 11)
+CLUSTER_CELLS_PER_TILE = 4
+
+# Columns written per parcel, in the order of the prepared row tuples
+LAND_COLUMNS = (
+    'section_code', 'section_name', 'parcel_no', 'city', 'district',
+    'area', 'land_use_zone', 'land_use_type', 'announced_value',
+    'announced_land_price', 'owner_name', 'owner_id', 'owner_type',
+    'right_range_type', 'right_denominator', 'right_numerator',
+    'declared_land_price', 'manager_name', 'source_file', 'geometry',
+)
+
+# Natural key of a parcel; upserts and bulk dedupe are keyed on it.
+# Section codes repeat across cities, so the city is part of the key
+LAND_KEY = ('city', 'section_code', 'parcel_no')
+
+# Positions of the LAND_KEY columns in a prepared row tuple
+LAND_KEY_INDEXES = tuple(LAND_COLUMNS.index(column) for column in LAND_KEY)
+
+# KML namespace used by the government polygon files
+KML_NS = 'http://www.opengis.net/kml/2.2'
+KML_NAMESPACES = {'kml': KML_NS}
+
+# Rows per INSERT/COPY round trip when streaming a file pair
+WRITE_BATCH_SIZE = 5000
+
+# Unlogged table the bulk mode COPYs into before swapping rows into lands
+STAGING_TABLE = 'lands_staging'
+
+# Schema where the bulk mode builds the replacement lands table and statistics
+# views, moved into the current schema by the swap
+NEXT_SCHEMA = 'lands_next'
+
+# Memory for building each index after a bulk load
+BULK_INDEX_MEMORY = '1GB'
+
+# EWKB header: little endian, Polygon type with the SRID flag set, SRID 4326
+EWKB_POLYGON_HEADER = struct.pack('<BII', 1, 3 | 0x20000000, 4326)
+
+# Bytes read at a time when checksumming source files
+CHECKSUM_CHUNK_SIZE = 1 << 20
+
+# Characters escaped in COPY text format
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+class ParseError(Exception):
+    """A source file could not be read to the end; none of its rows may be applied"""
+
+
+def _index_on(definition: str, name: str, table: str) -> str:
+    """CREATE INDEX statement from a pg_indexes definition, retargeted to table"""
+    unique = 'UNIQUE ' if definition.startswith('CREATE UNIQUE') else ''
+    return f'CREATE {unique}INDEX "{name}" ON {table}{definition[definition.index(" USING "):]}'
+
+
+def _release(elem):
+    """Free a fully processed iterparse element and the siblings parsed before it"""
+    elem.clear()
+    while elem.getprevious() is not None:
+        del elem.getparent()[0]
+
+
+def file_checksum(*paths: Path) -> str:
+    """SHA-256 over the contents of the given files, in order"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            while chunk := f.read(CHECKSUM_CHUNK_SIZE):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _dedupe_batch(rows: List[Tuple]) -> List[Tuple]:
+    """
+    Keep the last row per (city, section_code, parcel_no) in a batch
+
+    One upsert statement cannot touch the same row twice. Rows with a NULL
+    key never conflict and are kept as they are.
+    """
+    keyed = {}
+    unkeyed = []
+    for row in rows:
+        key = tuple(row[i] for i in LAND_KEY_INDEXES)
+        if None in key:
+            unkeyed.append(row)
+        else:
+            keyed[key] = row
+    return list(keyed.values()) + unkeyed
+
+
+def _batched(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    """Group a row stream into lists of at most size rows"""
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class StageTimer:
+    """
+    Wall time per import stage (checksum, parse, convert, match, insert, swap, refresh)
+
+    Time is charged to the innermost active stage, so nested stages are
+    exclusive: converting coordinates during the KML parse counts as
+    convert, not parse.
+    """
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self._stack = []
+        self._mark = perf_counter()
+
+    def _charge(self):
+        now = perf_counter()
+        if self._stack:
+            self.totals[self._stack[-1]] += now - self._mark
+        self._mark = now
+
+    @contextmanager
+    def stage(self, name: str):
+        self._charge()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._charge()
+            self._stack.pop()
+
+    def iterate(self, iterable: Iterable, name: str) -> Iterator:
+        """Charge the time spent producing each item to the named stage"""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                item = next(iterator, _EXHAUSTED)
+            if item is _EXHAUSTED:
+                return
+            yield item
+
+
+_EXHAUSTED = object()
+
 
 class LandDataImporter:
     """Handles importing land data from XML/KML files to PostgreSQL"""
 
-    def __init__(self, data_dir: str, db_url: str):
+    def __init__(self, data_dir: str, db_url: str, workers: int = 1,
+                 bulk: bool = False, incremental: bool = False):
         self.data_dir = Path(data_dir)
         self.db_url = db_url
+        self.workers = workers
+        self.bulk = bulk
+        self.incremental = incremental
         self.conn = None
+        # Set to a StageTimer to collect per-stage timings (see benchmarks/)
+        self.timer: Optional[StageTimer] = None
+        # (file_path, checksum, row_count) of files COPYed into staging
+        self.staged_files = []
+        # Source files whose pair failed to parse or write; left untouched in lands
+        self.failed_files = []
         self.stats = {
             'files_processed': 0,
+            'files_skipped': 0,
             'lands_imported': 0,
+            'lands_deleted': 0,
             'errors': 0
         }
 
+    def _stage(self, name: str):
+        return self.timer.stage(name) if self.timer else nullcontext()
+
+    def _timed(self, iterable: Iterable, name: str) -> Iterable:
+        return self.timer.iterate(iterable, name) if self.timer else iterable
+
     def connect_db(self):
         """Establish database connection"""
         try:
@@ -57,14 +239,18 @@ class LandDataImporter:
 
         Returns list of land records with attributes
         """
-        lands = []
+        return list(self.iter_xml_lands(xml_path))
 
-        try:
-            tree = etree.parse(str(xml_path))
-            root = tree.getroot()
+    def iter_xml_lands(self, xml_path: Path) -> Iterator[Dict]:
+        """
+        Stream land records from an XML file
 
-            # Find all 土地標示部 elements
-            for land_elem in root.findall('.//土地標示部'):
+        Each 土地標示部 element is cleared once read, so memory stays flat
+        regardless of file size. Raises ParseError if the file cannot be read
+        to the end, after any records already yielded.
+        """
+        try:
+            for _, land_elem in etree.iterparse(str(xml_path), events=('end',), tag='土地標示部'):
                 land_data = {
                     'city': self._get_text(land_elem, '縣市'),
                     'district': self._get_text(land_elem, '鄉鎮市區'),
@@ -92,82 +278,85 @@ class LandDataImporter:
                         'manager_name': self._get_text(owner_elem, '管理者名稱'),
                     })
 
-                lands.append(land_data)
+                _release(land_elem)
+                yield land_data
 
         except Exception as e:
-            logger.error(f"Error parsing XML file {xml_path}: {e}")
-            self.stats['errors'] += 1
-
-        return lands
+            raise ParseError(f"Error parsing XML file {xml_path}: {e}") from e
 
-    def parse_kml_file(self, kml_path: Path) -> Dict[str, str]:
+    def parse_kml_file(self, kml_path: Path) -> Dict[str, bytes]:
         """
         Parse KML file to extract polygon geometries
 
-        Returns dict mapping parcel_no to WKT polygon string
+        Returns dict mapping parcel_no to EWKB polygon bytes
         """
-        geometries = {}
+        return dict(self.iter_kml_geometries(kml_path))
 
-        try:
-            tree = etree.parse(str(kml_path))
-            root = tree.getroot()
+    def iter_kml_geometries(self, kml_path: Path) -> Iterator[Tuple[str, bytes]]:
+        """
+        Stream (parcel_no, polygon) pairs from a KML file, clearing each Placemark once read
 
-            # Define KML namespace
-            ns = {'kml': 'http://www.opengis.net/kml/2.2'}
+        Raises ParseError if the file cannot be read to the end.
+        """
+        try:
+            placemarks = etree.iterparse(str(kml_path), events=('end',), tag=f'{{{KML_NS}}}Placemark')
 
-            # Find all Placemark elements
-            for placemark in root.findall('.//kml:Placemark', ns):
+            for _, placemark in placemarks:
                 # Get parcel number from ExtendedData
                 parcel_no = None
-                schema_data = placemark.find('.//kml:SchemaData', ns)
+                schema_data = placemark.find('.//kml:SchemaData', KML_NAMESPACES)
                 if schema_data is not None:
-                    for simple_data in schema_data.findall('kml:SimpleData', ns):
+                    for simple_data in schema_data.findall('kml:SimpleData', KML_NAMESPACES):
                         if simple_data.get('name') == 'PARCELNO':
                             parcel_no = simple_data.text
                             break
 
-                if not parcel_no:
-                    continue
-
                 # Get polygon coordinates
-                coordinates_elem = placemark.find('.//kml:coordinates', ns)
-                if coordinates_elem is not None and coordinates_elem.text:
-                    wkt_polygon = self._kml_coords_to_wkt(coordinates_elem.text)
-                    if wkt_polygon:
-                        geometries[parcel_no] = wkt_polygon
+                polygon = None
+                coordinates_elem = placemark.find('.//kml:coordinates', KML_NAMESPACES)
+                if parcel_no and coordinates_elem is not None and coordinates_elem.text:
+                    with self._stage('convert'):
+                        polygon = self._kml_coords_to_ewkb(coordinates_elem.text)
 
-        except Exception as e:
-            logger.error(f"Error parsing KML file {kml_path}: {e}")
-            self.stats['errors'] += 1
+                _release(placemark)
+                if polygon:
+                    yield parcel_no, polygon
 
-        return geometries
+        except Exception as e:
+            raise ParseError(f"Error parsing KML file {kml_path}: {e}") from e
 
-    def _kml_coords_to_wkt(self, coords_text: str) -> Optional[str]:
+    def _kml_coords_to_ewkb(self, coords_text: str) -> Optional[bytes]:
         """
-        Convert KML coordinates to WKT POLYGON format
+        Convert KML coordinates to an EWKB polygon (SRID 4326)
 
-        KML format: "lon,lat,alt lon,lat,alt ..."
-        WKT format: "POLYGON((lon lat, lon lat, ...))"
+        The whole coordinate string is parsed into a float array in one
+        NumPy call and its bytes become the ring, so PostGIS receives binary
+        geometry instead of re-parsing WKT text for every parcel.
         """
         try:
-            coords = coords_text.strip().split()
-            points = []
+            coords_text = coords_text.strip()
+            if not coords_text:
+                return None
 
-            for coord in coords:
-                parts = coord.split(',')
-                if len(parts) >= 2:
-                    lon, lat = parts[0], parts[1]
-                    points.append(f"{lon} {lat}")
+            # Tuples are "lon,lat" or "lon,lat,alt"; keep lon/lat only
+            dims = coords_text.split(None, 1)[0].count(',') + 1
+            values = np.fromstring(coords_text.replace(',', ' '), dtype='<f8', sep=' ')
+            count = values.size // dims
+            if dims < 2 or values.size % dims or count < 3:
+                return None
+            if dims > 2:
+                values = values.reshape(count, dims)[:, :2].ravel()
 
-            if len(points) >= 3:
-                # Ensure polygon is closed
-                if points[0] != points[-1]:
-                    points.append(points[0])
+            ring = values.tobytes()
 
-                wkt = f"POLYGON(({', '.join(points)}))"
-                return wkt
+            # Ensure polygon is closed
+            if values[0] != values[-2] or values[1] != values[-1]:
+                ring += ring[:16]
+                count += 1
 
-        except Exception as e:
+            return EWKB_POLYGON_HEADER + struct.pack('<II', 1, count) + ring
+
+        except ValueError as e:
             logger.warning(f"Failed to convert coordinates: {e}")
 
         return None
@@ -225,41 +414,109 @@ class LandDataImporter:
 
         return parcel_no
 
-    def import_file_pair(self, xml_path: Path, kml_path: Path) -> int:
+    def source_name(self, xml_path: Path) -> str:
+        """Manifest / source_file key of a file pair: the XML path relative to the data directory"""
+        return xml_path.relative_to(self.data_dir).as_posix()
+
+    def import_file_pair(self, xml_path: Path, kml_path: Path, checksum: Optional[str] = None) -> int:
         """
         Import a pair of XML and KML files
 
         Returns number of records imported
         """
-        # Parse both files
-        lands = self.parse_xml_file(xml_path)
-        geometries = self.parse_kml_file(kml_path)
+        if checksum is None:
+            checksum = file_checksum(xml_path, kml_path)
+        return self.write_file_pair(xml_path, self.iter_file_pair_rows(xml_path, kml_path), checksum)
 
-        if not lands:
-            logger.warning(f"No land data found in {xml_path}")
+    def write_file_pair(self, xml_path: Path, rows: Iterable[Tuple], checksum: str) -> int:
+        """
+        Write the rows of one file pair in a single transaction
+
+        Rows are upserted into lands on (city, section_code, parcel_no); parcels
+        previously loaded from this file but absent now are deleted, and the
+        file is recorded in import_manifest. An interrupted run therefore
+        never leaves a file half applied. In bulk mode rows are COPYed into
+        the staging table instead and the manifest is written at the swap.
+
+        If rows raises (e.g. ParseError on a truncated file) the whole pair
+        is rolled back: nothing is upserted or deleted, the manifest keeps
+        its old checksum and the file is listed in failed_files.
+
+        Returns number of records written
+        """
+        source_file = self.source_name(xml_path)
+        cursor = self.conn.cursor()
+
+        try:
+            if self.bulk:
+                written = 0
+                for batch in _batched(rows, WRITE_BATCH_SIZE):
+                    with self._stage('insert'):
+                        written += self._copy_batch(cursor, batch)
+            else:
+                ids = []
+                for batch in _batched(rows, WRITE_BATCH_SIZE):
+                    with self._stage('insert'):
+                        ids.extend(self._upsert_batch(cursor, batch))
+                written = len(ids)
+
+                with self._stage('insert'):
+                    cursor.execute(
+                        "DELETE FROM lands WHERE source_file = %s AND id <> ALL(%s::int[])",
+                        (source_file, ids)
+                    )
+                    self.stats['lands_deleted'] += cursor.rowcount
+                    self._record_manifest(cursor, [(source_file, checksum, written)])
+
+            with self._stage('insert'):
+                self.conn.commit()
+
+        except Exception as e:
+            logger.error(f"Error writing data from {source_file}: {e}")
+            self.conn.rollback()
+            self.stats['errors'] += 1
+            self.failed_files.append(source_file)
             return 0
 
-        # Prepare insert data
-        insert_data = []
+        finally:
+            cursor.close()
 
-        for land in lands:
-            # Try to find matching geometry
-            parcel_no = land.get('parcel_no', '')
-            normalized_parcel = self._normalize_parcel_no(parcel_no)
+        if self.bulk:
+            self.staged_files.append((source_file, checksum, written))
+        return written
 
-            # Try different formats to match
-            geometry_wkt = None
-            for key in [parcel_no, normalized_parcel]:
-                if key in geometries:
-                    geometry_wkt = geometries[key]
-                    break
+    def prepare_file_pair(self, xml_path: Path, kml_path: Path) -> List[Tuple]:
+        """
+        Parse a pair of XML and KML files and match attributes to geometries
 
-            if not geometry_wkt:
-                logger.debug(f"No geometry found for parcel {parcel_no} (normalized: {normalized_parcel})")
+        Returns insert rows for lands with a matching geometry. Needs no
+        database connection, so it can run in a worker process.
+        """
+        return list(self.iter_file_pair_rows(xml_path, kml_path))
+
+    def iter_file_pair_rows(self, xml_path: Path, kml_path: Path) -> Iterator[Tuple]:
+        """
+        Stream insert rows for a pair of XML and KML files
+
+        Only the KML geometries are held in memory (they are looked up by
+        parcel number); land records are matched as they are parsed.
+        """
+        with self._stage('parse'):
+            geometries = self.parse_kml_file(kml_path)
+        source_file = self.source_name(xml_path)
+        found_lands = False
+
+        for land in self._timed(self.iter_xml_lands(xml_path), 'parse'):
+            found_lands = True
+
+            with self._stage('match'):
+                geometry = self._match_geometry(land, geometries)
+
+            if not geometry:
                 # Skip records without geometry for now
                 continue
 
-            insert_data.append((
+            yield (
                 land.get('section_code'),
                 land.get('section_name'),
                 land.get('parcel_no'),
@@ -278,51 +535,401 @@ class LandDataImporter:
                 land.get('right_numerator'),
                 land.get('declared_land_price'),
                 land.get('manager_name'),
-                geometry_wkt
-            ))
+                source_file,
+                geometry
+            )
 
-        # Bulk insert
-        if insert_data:
-            try:
-                cursor = self.conn.cursor()
-
-                insert_sql = """
-                    INSERT INTO lands (
-                        section_code, section_name, parcel_no, city, district,
-                        area, land_use_zone, land_use_type, announced_value,
-                        announced_land_price, owner_name, owner_id, owner_type,
-                        right_range_type, right_denominator, right_numerator,
-                        declared_land_price, manager_name, geometry
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s, %s, %s, %s,
-                        ST_GeomFromText(%s, 4326)
-                    )
-                """
+        if not found_lands:
+            logger.warning(f"No land data found in {xml_path}")
 
-                execute_batch(cursor, insert_sql, insert_data, page_size=1000)
-                self.conn.commit()
-                cursor.close()
+    def _match_geometry(self, land: Dict, geometries: Dict[str, bytes]) -> Optional[bytes]:
+        """Find the KML geometry for a land record by raw or normalized parcel number"""
+        parcel_no = land.get('parcel_no', '')
+        normalized_parcel = self._normalize_parcel_no(parcel_no)
 
-                return len(insert_data)
+        # Try different formats to match
+        for key in [parcel_no, normalized_parcel]:
+            if key in geometries:
+                return geometries[key]
 
-            except Exception as e:
-                logger.error(f"Error inserting data: {e}")
-                self.conn.rollback()
-                self.stats['errors'] += 1
-                return 0
+        logger.debug(f"No geometry found for parcel {parcel_no} (normalized: {normalized_parcel})")
+        return None
 
-        return 0
+    def _upsert_batch(self, cursor, rows: List[Tuple]) -> List[int]:
+        """
+        Insert or update a batch of rows in lands, keyed on (city, section_code, parcel_no)
 
-    def import_all_files(self):
-        """Import all XML/KML file pairs from data directory"""
+        Updated parcels get their simplified geometries cleared so the
+        post-import refresh recomputes them. Returns the ids written.
+        """
+        updates = ', '.join(
+            [f'{column} = EXCLUDED.{column}' for column in LAND_COLUMNS if column not in LAND_KEY]
+            + [f'{column} = NULL' for column in SIMPLIFY_LEVELS]
+        )
+        upsert_sql = f"""
+            INSERT INTO lands ({', '.join(LAND_COLUMNS)}) VALUES %s
+            ON CONFLICT ({', '.join(LAND_KEY)}) DO UPDATE SET {updates}
+            RETURNING id
+        """
+        template = f"({', '.join(['%s'] * (len(LAND_COLUMNS) - 1))}, ST_GeomFromEWKB(%s))"
+
+        result = execute_values(
+            cursor, upsert_sql, _dedupe_batch(rows), template=template, page_size=1000, fetch=True
+        )
+        return [land_id for land_id, in result]
+
+    def create_staging_table(self):
+        """Create an empty unlogged staging table shaped like lands, without indexes"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        cursor.execute(f"CREATE UNLOGGED TABLE {STAGING_TABLE} (LIKE lands INCLUDING DEFAULTS)")
+        self.conn.commit()
+        cursor.close()
+
+    def _copy_batch(self, cursor, rows: List[Tuple]) -> int:
+        """
+        COPY a batch of rows (geometry as hex EWKB) into the staging table
+
+        Returns number of records copied
+        """
+        buffer = io.StringIO()
+        for *attributes, geometry in rows:
+            for value in attributes:
+                buffer.write('\\N\t' if value is None else str(value).translate(COPY_ESCAPES) + '\t')
+            buffer.write(geometry.hex())
+            buffer.write('\n')
+        buffer.seek(0)
+
+        cursor.copy_expert(f"COPY {STAGING_TABLE} ({', '.join(LAND_COLUMNS)}) FROM STDIN", buffer)
+        return len(rows)
+
+    def _record_manifest(self, cursor, entries: List[Tuple[str, str, int]]):
+        """Upsert (file_path, checksum, row_count) entries into import_manifest"""
+        execute_values(cursor, """
+            INSERT INTO import_manifest (file_path, checksum, row_count, imported_at)
+            VALUES %s
+            ON CONFLICT (file_path) DO UPDATE
+            SET checksum = EXCLUDED.checksum,
+                row_count = EXCLUDED.row_count,
+                imported_at = EXCLUDED.imported_at
+        """, entries, template="(%s, %s, %s, NOW())")
+
+    def load_manifest(self) -> Dict[str, str]:
+        """Checksums of previously imported files, keyed by file path"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT file_path, checksum FROM import_manifest")
+        manifest = dict(cursor.fetchall())
+        cursor.close()
+        return manifest
+
+    def swap_staging_into_lands(self):
+        """
+        Replace lands with the staged rows
+
+        The replacement table and statistics views are built and indexed
+        while the API keeps reading the old ones; only the final swap of
+        schemas holds a lock on lands.
+        """
+        self.build_next_table()
+        self.build_next_views()
+        self.swap_next_table()
+
+    def build_next_table(self):
+        """
+        Build the replacement for lands from the staging table
+
+        The replacement is a logged table named lands in the NEXT_SCHEMA
+        schema, so its indexes and constraints keep their final names. The
+        deduplicated rows are copied in with their simplified geometries,
+        then its primary key and indexes are built once from the definitions
+        on lands and it is analyzed. Nothing here locks lands beyond a
+        normal read.
+        """
+        cursor = self.conn.cursor()
+        target = f"{NEXT_SCHEMA}.lands"
+
+        try:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {NEXT_SCHEMA} CASCADE")
+            cursor.execute(f"CREATE SCHEMA {NEXT_SCHEMA}")
+            cursor.execute(f"CREATE TABLE {target} (LIKE lands INCLUDING ALL EXCLUDING INDEXES)")
+            cursor.execute("SELECT obj_description('lands'::regclass, 'pg_class')")
+            comment, = cursor.fetchone()
+            cursor.execute(f"COMMENT ON TABLE {target} IS %s", (comment,))
+
+            # Last loaded row wins per (city, section_code, parcel_no); the id
+            # term keeps rows with a NULL key apart, as the unique index does.
+            # Simplifying here saves rewriting every row in a later UPDATE
+            key = ', '.join(LAND_KEY)
+            null_key = ' OR '.join(f'{column} IS NULL' for column in LAND_KEY)
+            simplified = ', '.join(
+                f'ST_SimplifyPreserveTopology(geometry, {tolerance})' for tolerance in SIMPLIFY_LEVELS.values()
+            )
+            cursor.execute(f"""
+                INSERT INTO {target} ({', '.join(LAND_COLUMNS + tuple(SIMPLIFY_LEVELS))})
+                SELECT {', '.join(LAND_COLUMNS)}, {simplified}
+                FROM (
+                    SELECT DISTINCT ON (
+                        {key}, CASE WHEN {null_key} THEN id END
+                    ) {', '.join(LAND_COLUMNS)}
+                    FROM {STAGING_TABLE}
+                    ORDER BY {key}, CASE WHEN {null_key} THEN id END, id DESC
+                ) latest
+            """)
+            logger.info(f"Moved {cursor.rowcount} rows from {STAGING_TABLE} into {target}")
+            cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+
+            # Primary key / unique constraints, then the remaining indexes
+            cursor.execute("""
+                SELECT conname, pg_get_constraintdef(oid)
+                FROM pg_constraint
+                WHERE conrelid = 'lands'::regclass AND contype IN ('p', 'u')
+            """)
+            constraints = cursor.fetchall()
+            cursor.execute("""
+                SELECT i.indexname, i.indexdef
+                FROM pg_indexes i
+                LEFT JOIN pg_constraint c ON c.conname = i.indexname
+                WHERE i.schemaname = current_schema() AND i.tablename = 'lands'
+                  AND c.conname IS NULL
+            """)
+            indexes = cursor.fetchall()
+
+            cursor.execute("SET LOCAL maintenance_work_mem = %s", (BULK_INDEX_MEMORY,))
+            for name, definition in tqdm(constraints, desc="Building constraints"):
+                cursor.execute(f'ALTER TABLE {target} ADD CONSTRAINT "{name}" {definition}')
+            for name, definition in tqdm(indexes, desc="Building indexes"):
+                cursor.execute(_index_on(definition, name, target))
+
+            self.conn.commit()
+
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        finally:
+            cursor.close()
+
+        # Planner statistics travel with the table when it changes schema
+        cursor = self.conn.cursor()
+        cursor.execute(f"ANALYZE {target}")
+        self.conn.commit()
+        cursor.close()
+
+    def build_next_views(self):
+        """
+        Build the statistics views over the replacement table
+
+        Each view is created in NEXT_SCHEMA from its saved definition with
+        NEXT_SCHEMA first on the search path, so the definition's lands
+        resolves to the replacement table. Indexes and comments are copied.
+        """
+        cursor = self.conn.cursor()
+
+        try:
+            # Read everything before the search path change, after which
+            # pg_matviews would qualify lands with the current schema
+            cursor.execute("""
+                SELECT m.matviewname, m.definition, obj_description(c.oid, 'pg_class')
+                FROM pg_matviews m
+                JOIN pg_class c ON c.relname = m.matviewname AND c.relnamespace = m.schemaname::regnamespace
+                WHERE m.schemaname = current_schema() AND m.matviewname = ANY(%s)
+            """, (list(STATS_ROLLUP_VIEWS),))
+            views = []
+            for name, definition, comment in cursor.fetchall():
+                cursor.execute("""
+                    SELECT indexname, indexdef FROM pg_indexes
+                    WHERE schemaname = current_schema() AND tablename = %s
+                """, (name,))
+                views.append((name, definition, comment, cursor.fetchall()))
+
+            cursor.execute("SELECT current_schema()")
+            schema, = cursor.fetchone()
+            cursor.execute(f"SET LOCAL search_path TO {NEXT_SCHEMA}, {schema}")
+
+            for name, definition, comment, indexes in views:
+                target = f"{NEXT_SCHEMA}.{name}"
+                cursor.execute(f"CREATE MATERIALIZED VIEW {target} AS {definition}")
+                for index_name, index_definition in indexes:
+                    cursor.execute(_index_on(index_definition, index_name, target))
+                cursor.execute(f"COMMENT ON MATERIALIZED VIEW {target} IS %s", (comment,))
+                logger.info(f"Built {target}")
+
+            self.conn.commit()
+
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        finally:
+            cursor.close()
+
+    def swap_next_table(self):
+        """
+        Move the replacement table and views in place of lands in one short transaction
+
+        Only catalog changes run under the lock: the old views and lands are
+        dropped, the replacements move to the current schema and the id
+        sequence is handed to the new lands. The manifest is replaced in the
+        same transaction.
+        """
+        cursor = self.conn.cursor()
+
+        try:
+            cursor.execute("SELECT current_schema(), pg_get_serial_sequence('lands', 'id')")
+            schema, sequence = cursor.fetchone()
+            cursor.execute(
+                "SELECT matviewname FROM pg_matviews WHERE schemaname = %s", (NEXT_SCHEMA,)
+            )
+            views = [name for name, in cursor.fetchall()]
+
+            cursor.execute("LOCK TABLE lands IN ACCESS EXCLUSIVE MODE")
+            for name in views:
+                cursor.execute(f"DROP MATERIALIZED VIEW IF EXISTS {schema}.{name}")
+
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+            cursor.execute("DROP TABLE lands")
+            cursor.execute(f"ALTER TABLE {NEXT_SCHEMA}.lands SET SCHEMA {schema}")
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY lands.id")
+            for name in views:
+                cursor.execute(f"ALTER MATERIALIZED VIEW {NEXT_SCHEMA}.{name} SET SCHEMA {schema}")
+            cursor.execute(f"DROP SCHEMA {NEXT_SCHEMA}")
+
+            cursor.execute("TRUNCATE import_manifest")
+            self._record_manifest(cursor, self.staged_files)
+
+            self.conn.commit()
+            logger.info("Swapped the replacement lands and statistics views into place")
+
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        finally:
+            cursor.close()
+
+    def refresh_simplified_geometries(self):
+        """Fill the simplified geometry columns for parcels that lack them"""
+        cursor = self.conn.cursor()
+
+        for column, tolerance in SIMPLIFY_LEVELS.items():
+            cursor.execute(f"""
+                UPDATE lands
+                SET {column} = ST_SimplifyPreserveTopology(geometry, %s)
+                WHERE {column} IS NULL AND geometry IS NOT NULL
+            """, (tolerance,))
+            logger.info(f"Simplified {cursor.rowcount} geometries into {column}")
+
+        self.conn.commit()
+        cursor.close()
+
+    def refresh_clusters(self):
+        """Rebuild the multi-resolution grid clusters from the lands table"""
+        cursor = self.conn.cursor()
+
+        # One representative point per parcel, shared by every zoom level
+        cursor.execute("""
+            CREATE TEMP TABLE cluster_points ON COMMIT DROP AS
+            SELECT ST_X(p) AS lng, ST_Y(p) AS lat, area
+            FROM (
+                SELECT ST_PointOnSurface(geometry) AS p, area
+                FROM lands
+                WHERE geometry IS NOT NULL
+            ) points
+        """)
+        cursor.execute("TRUNCATE land_clusters")
+
+        for zoom in CLUSTER_ZOOMS:
+            cell_size = 360.0 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+            cursor.execute("""
+                INSERT INTO land_clusters (
+                    zoom, cell_x, cell_y, parcel_count, total_area, centroid
+                )
+                SELECT
+                    %(zoom)s,
+                    floor(lng / %(cell_size)s)::int AS cell_x,
+                    floor(lat / %(cell_size)s)::int AS cell_y,
+                    count(*),
+                    sum(area),
+                    ST_SetSRID(ST_MakePoint(avg(lng), avg(lat)), 4326)
+                FROM cluster_points
+                GROUP BY cell_x, cell_y
+            """, {'zoom': zoom, 'cell_size': cell_size})
+            logger.info(f"Zoom {zoom}: {cursor.rowcount} cluster cells")
+
+        self.conn.commit()
+        cursor.close()
+
+    def refresh_gazetteer(self):
+        """Rebuild the city / district / section gazetteer with counts and extents"""
+        cursor = self.conn.cursor()
+        cursor.execute("TRUNCATE gazetteer RESTART IDENTITY")
+        cursor.execute("""
+            INSERT INTO gazetteer (
+                level, city, district, section_code, section_name, parcel_count,
+                min_lng, min_lat, max_lng, max_lat
+            )
+            SELECT
+                level, city, district, section_code, section_name, parcel_count,
+                ST_XMin(extent), ST_YMin(extent), ST_XMax(extent), ST_YMax(extent)
+            FROM (
+                SELECT
+                    CASE GROUPING(district, section_code)
+                        WHEN 3 THEN 'city'
+                        WHEN 1 THEN 'district'
+                        ELSE 'section'
+                    END AS level,
+                    city,
+                    district,
+                    section_code,
+                    CASE WHEN GROUPING(section_code) = 0 THEN MAX(section_name) END AS section_name,
+                    COUNT(*) AS parcel_count,
+                    ST_Extent(geometry) AS extent
+                FROM lands
+                WHERE city IS NOT NULL AND district IS NOT NULL AND section_code IS NOT NULL
+                GROUP BY GROUPING SETS ((city), (city, district), (city, district, section_code))
+            ) nodes
+        """)
+        logger.info(f"Gazetteer: {cursor.rowcount} nodes")
+        self.conn.commit()
+        cursor.close()
+
+    def refresh_stats_rollups(self):
+        """Refresh the statistics materialized views read by /api/stats/*"""
+        cursor = self.conn.cursor()
+
+        # CONCURRENTLY keeps the views readable by the API during the refresh
+        for view in STATS_ROLLUP_VIEWS:
+            cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+            self.conn.commit()
+            logger.info(f"Refreshed {view}")
+
+        cursor.close()
+
+    def update_dataset_version(self):
+        """Write a new dataset version stamp after a completed import"""
+        version = datetime.now().strftime('%Y%m%d%H%M%S')
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT INTO dataset_version (id, version, updated_at)
+            VALUES (1, %s, NOW())
+            ON CONFLICT (id) DO UPDATE
+            SET version = EXCLUDED.version, updated_at = EXCLUDED.updated_at
+        """, (version,))
+        self.conn.commit()
+        cursor.close()
+
+        logger.info(f"Dataset version: {version}")
+
+    def find_file_pairs(self) -> List[Tuple[Path, Path]]:
+        """Find XML files with a matching KML file; missing KMLs count as errors"""
         # Find all XML files
         xml_files = sorted(self.data_dir.glob('*.xml'))
 
         logger.info(f"Found {len(xml_files)} XML files to process")
 
-        # Process each file pair
-        for xml_path in tqdm(xml_files, desc="Importing land data"):
+        file_pairs = []
+        for xml_path in xml_files:
             kml_path = xml_path.with_suffix('.kml')
 
             if not kml_path.exists():
@@ -330,29 +937,156 @@ class LandDataImporter:
                 self.stats['errors'] += 1
                 continue
 
-            imported = self.import_file_pair(xml_path, kml_path)
-            self.stats['files_processed'] += 1
-            self.stats['lands_imported'] += imported
+            file_pairs.append((xml_path, kml_path))
 
-            # Commit every 10 files to avoid long transactions
-            if self.stats['files_processed'] % 10 == 0:
-                self.conn.commit()
-                logger.info(f"Progress: {self.stats['files_processed']} files, "
-                          f"{self.stats['lands_imported']} lands imported")
+        return file_pairs
 
-        # Final commit
-        self.conn.commit()
+    def select_file_pairs(self, file_pairs: List[Tuple[Path, Path]]) -> List[Tuple[Path, Path, str]]:
+        """
+        Checksum each file pair; in incremental mode drop pairs unchanged since the last import
+
+        Returns (xml_path, kml_path, checksum) for the pairs to import.
+        """
+        manifest = self.load_manifest() if self.incremental else {}
+        selected = []
+
+        for xml_path, kml_path in file_pairs:
+            checksum = file_checksum(xml_path, kml_path)
+            if manifest.get(self.source_name(xml_path)) == checksum:
+                self.stats['files_skipped'] += 1
+                continue
+            selected.append((xml_path, kml_path, checksum))
+
+        if self.incremental:
+            logger.info(f"{len(selected)} changed file pairs, {self.stats['files_skipped']} unchanged")
+
+        return selected
+
+    def _record_file(self, imported: int):
+        """Update progress counters after a file pair has been written"""
+        self.stats['files_processed'] += 1
+        self.stats['lands_imported'] += imported
+
+        # Log progress every 10 files
+        if self.stats['files_processed'] % 10 == 0:
+            logger.info(f"Progress: {self.stats['files_processed']} files, "
+                      f"{self.stats['lands_imported']} lands imported")
+
+    def _import_parallel(self, file_pairs: List[Tuple[Path, Path, str]]):
+        """
+        Parse and match file pairs in a process pool, writing from this process
+
+        At most 2 x workers pairs are in flight so prepared rows cannot pile
+        up in memory when the database is the bottleneck.
+        """
+        pending = iter(file_pairs)
+        in_flight = {}
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool, \
+                tqdm(total=len(file_pairs), desc="Importing land data") as progress:
+
+            def submit_next():
+                pair = next(pending, None)
+                if pair is not None:
+                    xml_path, kml_path, _ = pair
+                    future = pool.submit(_prepare_file_pair, str(self.data_dir), xml_path, kml_path)
+                    in_flight[future] = pair
+
+            for _ in range(self.workers * 2):
+                submit_next()
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    xml_path, _, checksum = in_flight.pop(future)
+                    submit_next()
+
+                    try:
+                        rows = future.result()
+                    except Exception as e:
+                        # Same as a failed write: the pair's rows and manifest entry stay as they are
+                        logger.error(f"Worker failed on {xml_path}: {e}")
+                        self.stats['errors'] += 1
+                        self.failed_files.append(self.source_name(xml_path))
+                        imported = 0
+                    else:
+                        imported = self.write_file_pair(xml_path, rows, checksum)
+
+                    self._record_file(imported)
+                    progress.update(1)
+
+    def import_all_files(self):
+        """Import all XML/KML file pairs from data directory"""
+        with self._stage('checksum'):
+            file_pairs = self.select_file_pairs(self.find_file_pairs())
+
+        if self.bulk:
+            self.create_staging_table()
+
+        # Process each file pair
+        if self.workers > 1:
+            self._import_parallel(file_pairs)
+        else:
+            for xml_path, kml_path, checksum in tqdm(file_pairs, desc="Importing land data"):
+                imported = self.import_file_pair(xml_path, kml_path, checksum)
+                self._record_file(imported)
+
+        if self.bulk:
+            # The swap replaces every parcel, so a failed pair would lose its rows
+            if self.failed_files:
+                raise RuntimeError(
+                    f"{len(self.failed_files)} file pairs failed; lands left unchanged "
+                    f"(first: {self.failed_files[0]})"
+                )
+            with self._stage('swap'):
+                self.swap_staging_into_lands()
+
+        if file_pairs:
+            # Rebuild derived tables read by the API
+            # The bulk swap brings simplified geometries and statistics views
+            # already built over the new rows
+            with self._stage('refresh'):
+                if not self.bulk:
+                    self.refresh_simplified_geometries()
+                self.refresh_clusters()
+                self.refresh_gazetteer()
+                if not self.bulk:
+                    self.refresh_stats_rollups()
+
+            # Stamp a new dataset version so API caches drop stale entries
+            self.update_dataset_version()
+        else:
+            logger.info("No changed files; derived tables left as they are")
 
         # Print summary
         logger.info("=" * 60)
         logger.info("Import completed!")
         logger.info(f"Files processed: {self.stats['files_processed']}")
+        logger.info(f"Files unchanged (skipped): {self.stats['files_skipped']}")
         logger.info(f"Lands imported: {self.stats['lands_imported']}")
+        logger.info(f"Stale lands deleted: {self.stats['lands_deleted']}")
         logger.info(f"Errors: {self.stats['errors']}")
         logger.info("=" * 60)
 
 
+def _prepare_file_pair(data_dir: str, xml_path: Path, kml_path: Path) -> List[Tuple]:
+    """Process pool entry point: returns the insert rows, raising ParseError on a damaged file"""
+    importer = LandDataImporter(data_dir, db_url=None)
+    return importer.prepare_file_pair(xml_path, kml_path)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Import Taiwan land XML/KML data into PostgreSQL")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes parsing file pairs in parallel (default: 1, serial)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--bulk', action='store_true',
+                      help="Replace all lands via COPY into a staging table, rebuilding indexes once")
+    mode.add_argument('--incremental', action='store_true',
+                      help="Skip file pairs whose checksum matches import_manifest")
+    args = parser.parse_args()
+
     # Load environment variables
     load_dotenv()
 
@@ -367,7 +1101,12 @@ def main():
         sys.exit(1)
 
     # Create importer and run
-    importer = LandDataImporter(data_dir, db_url)
+    importer = LandDataImporter(
+        data_dir, db_url,
+        workers=max(1, args.workers),
+        bulk=args.bulk,
+        incremental=args.incremental
+    )
 
     try:
         importer.connect_db()